@@ -1,3 +1,38 @@
+import hashlib
+import json
+import mmap
+import os
+import sys
+from array import array
+from collections import deque
+
+
+closureTracer = None
+instrumentation = None
+
+ERROR, SHIFT, REDUCE, ACCEPT = 0, 1, 2, 3
+
+# Overridden by the LR_TABLE_CACHE_DIR environment variable or the cacheDir
+# argument, e.g. when this directory is read-only.
+TABLE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__tablecache__")
+TABLE_MAGIC = b"LR0T"
+TABLE_FORMAT = 1
+
+
+def setClosureTracer(tracer):
+    # Pass print (or any callable taking a message) to see every item closure
+    # adds; None turns tracing back off.
+    global closureTracer
+    closureTracer = tracer
+
+
+def setInstrumentation(recorder):
+    # Takes an Instrumentation from compiler/instrumentation.py; with None the
+    # closure, goto and collection hooks cost one check each.
+    global instrumentation
+    instrumentation = recorder
+
+
 class Grammar:
     def __init__(self, rules):
         self.rules = rules
@@ -8,6 +43,12 @@ class Grammar:
                 for symbol in prod:
                     if symbol not in self.nonTerminals:
                         self.terminals.add(symbol)
+        self.engine = None
+
+    def itemEngine(self):
+        if self.engine is None:
+            self.engine = ItemEngine(self)
+        return self.engine
 
 
 class Item:
@@ -35,77 +76,397 @@ class Item:
         return hash((self.lhs, tuple(self.rhs), self.dotPosition))
 
 
+class ItemEngine:
+    # Items are packed as (productionId << dotBits) | dotPosition so a state is
+    # a frozenset of small ints; production 0 is the augmented S' -> S.
+    def __init__(self, grammar: Grammar, start="S"):
+        self.grammar = grammar
+        self.productions = [("S'", [start])]
+        for lhs, prodList in grammar.rules.items():
+            for prod in prodList:
+                self.productions.append((lhs, prod))
+        longest = max(len(rhs) for _, rhs in self.productions)
+        self.dotBits = longest.bit_length()
+        self.dotMask = (1 << self.dotBits) - 1
+        self.productionIds = {}
+        self.startItems = {nonTerminal: [] for nonTerminal in grammar.nonTerminals}
+        self.nextSymbol = [None] * (len(self.productions) << self.dotBits)
+        for prodId, (lhs, rhs) in enumerate(self.productions):
+            base = prodId << self.dotBits
+            self.productionIds[(lhs, tuple(rhs))] = prodId
+            if lhs in self.startItems:
+                self.startItems[lhs].append(base)
+            for dot, symbol in enumerate(rhs):
+                self.nextSymbol[base | dot] = symbol
+        self.items = {}
+        self.nonTerminalClosures = {}
+
+    def pack(self, prodId, dotPosition=0):
+        return (prodId << self.dotBits) | dotPosition
+
+    def production(self, item):
+        return self.productions[item >> self.dotBits]
+
+    def dotPosition(self, item):
+        return item & self.dotMask
+
+    def encode(self, item: Item):
+        prodId = self.productionIds[(item.lhs, tuple(item.rhs))]
+        return self.pack(prodId, item.dotPosition)
+
+    def decode(self, item):
+        decoded = self.items.get(item)
+        if decoded is None:
+            lhs, rhs = self.production(item)
+            decoded = self.items[item] = Item(lhs, rhs, item & self.dotMask)
+        return decoded
+
+    def describe(self, item):
+        return repr(self.decode(item))
+
+    def decodeState(self, state):
+        return {self.decode(item) for item in state}
+
+    def nonTerminalClosure(self, nonTerminal):
+        cached = self.nonTerminalClosures.get(nonTerminal)
+        if instrumentation is not None:
+            instrumentation.cache("nonterminal_closure", cached is not None)
+        if cached is not None:
+            return cached
+        nextSymbol = self.nextSymbol
+        startItems = self.startItems
+        closureSet = set(startItems[nonTerminal])
+        pending = list(closureSet)
+        while pending:
+            symbol = nextSymbol[pending.pop()]
+            if symbol in startItems:
+                for item in startItems[symbol]:
+                    if item not in closureSet:
+                        closureSet.add(item)
+                        pending.append(item)
+        cached = self.nonTerminalClosures[nonTerminal] = frozenset(closureSet)
+        return cached
+
+    def closure(self, kernel):
+        if instrumentation is not None:
+            with instrumentation.phase("closure"):
+                state = self.computeClosure(kernel)
+            instrumentation.count("closure_items", len(state))
+            return state
+        return self.computeClosure(kernel)
+
+    def computeClosure(self, kernel):
+        nextSymbol = self.nextSymbol
+        startItems = self.startItems
+        closureSet = set(kernel)
+        for symbol in {nextSymbol[item] for item in kernel}:
+            if symbol in startItems:
+                closureSet |= self.nonTerminalClosure(symbol)
+        if closureTracer is not None:
+            for item in closureSet.difference(kernel):
+                closureTracer(f"Adding new item to closure: {self.decode(item)}")
+        return frozenset(closureSet)
+
+    def goto(self, state, symbol):
+        nextSymbol = self.nextSymbol
+        if instrumentation is not None:
+            with instrumentation.phase("goto"):
+                return self.closure({item + 1 for item in state if nextSymbol[item] == symbol})
+        return self.closure({item + 1 for item in state if nextSymbol[item] == symbol})
+
+    def canonicalCollection(self):
+        if instrumentation is not None:
+            with instrumentation.phase("canonical_collection"):
+                states, transitions = self.buildCollection()
+            instrumentation.count("states", len(states))
+            instrumentation.count("transitions", len(transitions))
+            return states, transitions
+        return self.buildCollection()
+
+    def buildCollection(self):
+        nextSymbol = self.nextSymbol
+        startState = self.closure({self.pack(0)})
+        states = [startState]
+        stateMapping = {startState: 0}
+        transitions = {}
+        worklist = deque([0])
+
+        while worklist:
+            index = worklist.popleft()
+            kernels = {}
+            for item in states[index]:
+                symbol = nextSymbol[item]
+                if symbol is not None:
+                    kernels.setdefault(symbol, set()).add(item + 1)
+            for symbol, kernel in kernels.items():
+                nextState = self.closure(kernel)
+                nextIndex = stateMapping.get(nextState)
+                if nextIndex is None:
+                    nextIndex = len(states)
+                    states.append(nextState)
+                    stateMapping[nextState] = nextIndex
+                    worklist.append(nextIndex)
+                transitions[(index, symbol)] = nextIndex
+
+        return states, transitions
+
+
 def closure(items, grammar: Grammar):
-    closureSet = set(items)
-    while True:
-        added = False
-        for item in list(closureSet):
-            if item.dotPosition < len(item.rhs):
-                symbol = item.rhs[item.dotPosition]
-                if symbol in grammar.nonTerminals:
-                    for prod in grammar.rules[symbol]:
-                        newItem = Item(symbol, prod, 0)
-                        if newItem not in closureSet:
-                            print(f"Adding new item to closure: {newItem}")
-                            closureSet.add(newItem)
-                            added = True
-        if not added:
-            break
-    return closureSet
+    engine = grammar.itemEngine()
+    return engine.decodeState(engine.closure({engine.encode(item) for item in items}))
 
 
 def goto(items, symbol, grammar):
-    nextItems = {Item(item.lhs, item.rhs, item.dotPosition + 1) 
-                 for item in items if item.dotPosition < len(item.rhs) and item.rhs[item.dotPosition] == symbol}
-    return closure(nextItems, grammar)
+    engine = grammar.itemEngine()
+    return engine.decodeState(engine.goto({engine.encode(item) for item in items}, symbol))
 
 
 def constructCanonicalCollection(grammar: Grammar):
-    startItem = Item("S'", ["S"])
-    startState = closure({startItem}, grammar)
-    states = [startState]
-    stateMapping = {frozenset(startState): 0}  
-    transitions = {}
-    
-    while True:
-        added = False
-        for state in states:
-            for symbol in grammar.terminals.union(grammar.nonTerminals):
-                nextState = goto(state, symbol, grammar)
-                if nextState and frozenset(nextState) not in stateMapping:
-                    states.append(nextState)
-                    stateMapping[frozenset(nextState)] = len(states) - 1
-                    transitions[(states.index(state), symbol)] = len(states) - 1
-                    added = True
-        if not added:
-            break
-    
+    engine = grammar.itemEngine()
+    packedStates, transitions = engine.canonicalCollection()
+    states = [engine.decodeState(state) for state in packedStates]
     return states, transitions
 
 
 def constructParsingTable(states, transitions, grammar):
     action = {}
     gotoTable = {}
+    lookaheads = grammar.terminals | {"$"}
     for i, state in enumerate(states):
         for item in state:
             if item.isCompleted():
                 if item.lhs == "S'":
-                    action[i] = ("accept",)
+                    action[(i, "$")] = ("accept",)
                 else:
-                    action[i] = ("reduce", item.lhs, item.rhs)
+                    for terminal in lookaheads:
+                        action[(i, terminal)] = ("reduce", item.lhs, item.rhs)
             else:
                 symbol = item.rhs[item.dotPosition]
+                nextState = transitions.get((i, symbol))
+                if nextState is None:
+                    continue
                 if symbol in grammar.terminals:
-                    nextState = transitions.get((i, symbol))
-                    if nextState is not None:
-                        action[i] = ("shift", nextState)
+                    action[(i, symbol)] = ("shift", nextState)
                 elif symbol in grammar.nonTerminals:
-                    nextState = transitions.get((i, symbol))
-                    if nextState is not None:
-                        gotoTable[i] = nextState
+                    gotoTable[(i, symbol)] = nextState
     return action, gotoTable
 
 
+class DenseParsingTable:
+    # Both matrices are row-major with the same stride, so a state is carried
+    # around as its row offset (state * rowWidth) and the parse loop never
+    # multiplies. ACTION cells hold (argument << 2) | opcode, where the
+    # argument is the target row for SHIFT and the production id for REDUCE.
+    # GOTO cells hold the target row or -1.
+    def __init__(self, terminals, nonTerminals, productions, stateCount, action=None, gotoTable=None):
+        self.terminals = terminals
+        self.nonTerminals = nonTerminals
+        self.productions = productions
+        self.stateCount = stateCount
+        self.terminalIds = {terminal: i for i, terminal in enumerate(terminals)}
+        self.nonTerminalIds = {nonTerminal: i for i, nonTerminal in enumerate(nonTerminals)}
+        self.rowWidth = max(len(terminals), len(nonTerminals))
+        if action is None:
+            action = array("i", bytes(4 * stateCount * self.rowWidth))
+        if gotoTable is None:
+            gotoTable = array("i", [-1]) * (stateCount * self.rowWidth)
+        self.action = action
+        self.gotoTable = gotoTable
+        self.reduceLength = array("H", (len(rhs) for _, rhs in productions))
+        self.reduceLhs = array("H", (self.nonTerminalIds.get(lhs, 0) for lhs, _ in productions))
+        self.conflicts = []
+
+    def setAction(self, state, terminal, opcode, argument=0):
+        index = state * self.rowWidth + self.terminalIds[terminal]
+        if opcode == SHIFT:
+            argument *= self.rowWidth
+        entry = (argument << 2) | opcode
+        existing = self.action[index]
+        if existing == ERROR:
+            self.action[index] = entry
+        elif existing != entry:
+            self.conflicts.append((state, terminal, existing, entry))
+
+    def setGoto(self, state, nonTerminal, target):
+        index = state * self.rowWidth + self.nonTerminalIds[nonTerminal]
+        self.gotoTable[index] = target * self.rowWidth
+
+    def describeEntry(self, entry):
+        opcode, argument = entry & 3, entry >> 2
+        if opcode == SHIFT:
+            return f"shift {argument // self.rowWidth}"
+        if opcode == REDUCE:
+            lhs, rhs = self.productions[argument]
+            return f"reduce {lhs} -> {' '.join(rhs)}"
+        if opcode == ACCEPT:
+            return "accept"
+        return "error"
+
+    def conflictReport(self):
+        return [
+            f"State {state} on '{terminal}': {self.describeEntry(existing)} vs {self.describeEntry(entry)}"
+            for state, terminal, existing, entry in self.conflicts
+        ]
+
+    def encodeTokens(self, tokens):
+        terminalIds = self.terminalIds
+        try:
+            tokenIds = array("H", (terminalIds[token] for token in tokens))
+        except KeyError:
+            return None
+        tokenIds.append(terminalIds["$"])
+        return tokenIds
+
+    def parseTokens(self, tokenIds):
+        action = self.action
+        gotoTable = self.gotoTable
+        reduceLength = self.reduceLength
+        reduceLhs = self.reduceLhs
+        stack = [0]
+        push = stack.append
+        row = 0
+        index = 0
+        token = tokenIds[0]
+        while True:
+            entry = action[row + token]
+            opcode = entry & 3
+            if opcode == SHIFT:
+                row = entry >> 2
+                push(row)
+                index += 1
+                token = tokenIds[index]
+            elif opcode == REDUCE:
+                production = entry >> 2
+                length = reduceLength[production]
+                if length:
+                    del stack[-length:]
+                row = gotoTable[stack[-1] + reduceLhs[production]]
+                push(row)
+            else:
+                return opcode == ACCEPT
+
+    def parse(self, inputString):
+        tokenIds = self.encodeTokens(inputString.split())
+        return tokenIds is not None and self.parseTokens(tokenIds)
+
+
+def compileParsingTable(grammar: Grammar):
+    engine = grammar.itemEngine()
+    states, transitions = engine.canonicalCollection()
+    table = DenseParsingTable(
+        sorted(grammar.terminals) + ["$"],
+        sorted(grammar.nonTerminals),
+        engine.productions,
+        len(states),
+    )
+    for (state, symbol), target in transitions.items():
+        if symbol in grammar.nonTerminals:
+            table.setGoto(state, symbol, target)
+        else:
+            table.setAction(state, symbol, SHIFT, target)
+    for state, items in enumerate(states):
+        for item in sorted(items):
+            if engine.nextSymbol[item] is not None:
+                continue
+            prodId = item >> engine.dotBits
+            if prodId == 0:
+                table.setAction(state, "$", ACCEPT)
+            else:
+                for terminal in table.terminals:
+                    table.setAction(state, terminal, REDUCE, prodId)
+    return table
+
+
+def grammarHash(grammar: Grammar, start="S"):
+    payload = json.dumps([TABLE_FORMAT, sys.byteorder, start, list(grammar.rules.items())])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def saveParsingTable(table: DenseParsingTable, path):
+    # Layout: magic, header length, JSON header, padding to a 4-byte boundary,
+    # then the raw ACTION and GOTO cells so they can be mapped back in place.
+    header = json.dumps({
+        "terminals": table.terminals,
+        "nonTerminals": table.nonTerminals,
+        "productions": table.productions,
+        "stateCount": table.stateCount,
+        "conflicts": table.conflicts,
+    }).encode()
+    padding = -(8 + len(header)) % 4
+    temporaryPath = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporaryPath, "wb") as file:
+            file.write(TABLE_MAGIC)
+            file.write(len(header).to_bytes(4, "little"))
+            file.write(header)
+            file.write(bytes(padding))
+            file.write(bytes(table.action))
+            file.write(bytes(table.gotoTable))
+        os.replace(temporaryPath, path)
+    except OSError:
+        removeFile(temporaryPath)
+        raise
+
+
+def removeFile(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def tableCacheDir(cacheDir=None):
+    if cacheDir is not None:
+        return cacheDir
+    return os.environ.get("LR_TABLE_CACHE_DIR") or TABLE_CACHE_DIR
+
+
+def loadParsingTable(path):
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:4] != TABLE_MAGIC:
+        raise ValueError(f"Not a parsing table file: {path}")
+    headerLength = int.from_bytes(buffer[4:8], "little")
+    header = json.loads(buffer[8:8 + headerLength])
+    start = 8 + headerLength + (-(8 + headerLength) % 4)
+    cellBytes = 4 * header["stateCount"] * max(len(header["terminals"]), len(header["nonTerminals"]))
+    if len(buffer) != start + 2 * cellBytes:
+        raise ValueError(f"Truncated parsing table file: {path}")
+    view = memoryview(buffer)
+    table = DenseParsingTable(
+        header["terminals"],
+        header["nonTerminals"],
+        [tuple(production) for production in header["productions"]],
+        header["stateCount"],
+        view[start:start + cellBytes].cast("i"),
+        view[start + cellBytes:].cast("i"),
+    )
+    table.conflicts = [tuple(conflict) for conflict in header["conflicts"]]
+    return table
+
+
+def cachedParsingTable(grammar: Grammar, cacheDir=None):
+    cacheDir = tableCacheDir(cacheDir)
+    path = os.path.join(cacheDir, f"lr0-{grammarHash(grammar)}.tbl")
+    try:
+        table = loadParsingTable(path)
+    except (OSError, ValueError):
+        pass
+    else:
+        if instrumentation is not None:
+            instrumentation.cache("parsing_table", True)
+        return table
+    if instrumentation is not None:
+        instrumentation.cache("parsing_table", False)
+    table = compileParsingTable(grammar)
+    try:
+        os.makedirs(cacheDir, exist_ok=True)
+        saveParsingTable(table, path)
+    except OSError:
+        pass  # An unwritable cache only costs the next run a rebuild.
+    return table
+
+
 def parse(inputString, action, gotoTable, grammar):
     stack = [0]
     inputTokens = inputString.split() + ["$"]
@@ -113,47 +474,53 @@ def parse(inputString, action, gotoTable, grammar):
     while True:
         state = stack[-1]
         token = inputTokens[index]
-        if state in action:
-            act = action[state]
-            if act[0] == "shift":
-                stack.append(act[1])
-                index += 1
-            elif act[0] == "reduce":
-                lhs, rhs = act[1], act[2]
-                for _ in range(len(rhs)):
-                    stack.pop()
-                state = stack[-1]
-                stack.append(gotoTable[state])
-            elif act[0] == "accept":
-                return True
-        else:
+        act = action.get((state, token))
+        if act is None:
             return False
+        if act[0] == "shift":
+            stack.append(act[1])
+            index += 1
+        elif act[0] == "reduce":
+            lhs, rhs = act[1], act[2]
+            for _ in range(len(rhs)):
+                stack.pop()
+            state = stack[-1]
+            stack.append(gotoTable[(state, lhs)])
+        elif act[0] == "accept":
+            return True
 
 
-rules = {
-    "S": [["A"]],
-    "A": [["a", "A"], ["b"]]
-}
+if __name__ == "__main__":
+    rules = {
+        "S": [["A"]],
+        "A": [["a", "A"], ["b"]]
+    }
 
 
-grammar = Grammar(rules)
+    grammar = Grammar(rules)
+
+    states, transitions = constructCanonicalCollection(grammar)
+    print("\nCanonical States:")
+    for i, state in enumerate(states):
+        print(f"State {i}:\n{state}")
 
-states, transitions = constructCanonicalCollection(grammar)
-print("\nCanonical States:")
-for i, state in enumerate(states):
-    print(f"State {i}:\n{state}")
+    print("\nTransitions:")
+    for key, value in transitions.items():
+        print(f"From State {key[0]} on '{key[1]}': Go to State {value}")
 
-print("\nTransitions:")
-for key, value in transitions.items():
-    print(f"From State {key[0]} on '{key[1]}': Go to State {value}")
 
+    action, gotoTable = constructParsingTable(states, transitions, grammar)
+    print("\nAction Table:")
+    print(action)
+    print("\nGoto Table:")
+    print(gotoTable)
 
-action, gotoTable = constructParsingTable(states, transitions, grammar)
-print("\nAction Table:")
-print(action)
-print("\nGoto Table:")
-print(gotoTable)
+    inputString = "a a b"
+    result = parse(inputString, action, gotoTable, grammar)
+    print(f"\nParsing result for '{inputString}': {'Accepted' if result else 'Rejected'}")
 
-inputString = "a a b"
-result = parse(inputString, action, gotoTable, grammar)
-print(f"\nParsing result for '{inputString}': {'Accepted' if result else 'Rejected'}")
+    denseTable = cachedParsingTable(grammar)
+    for conflict in denseTable.conflictReport():
+        print(f"Conflict: {conflict}")
+    result = denseTable.parse(inputString)
+    print(f"Dense table result for '{inputString}': {'Accepted' if result else 'Rejected'}")
@@ -1,4 +1,23 @@
+import hashlib
+import json
+import marshal
+import mmap
+import os
 import re
+from collections import deque
+
+
+# Overridden by the LR_TABLE_CACHE_DIR environment variable or the cacheDir
+# argument, e.g. when this directory is read-only.
+TABLE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__tablecache__")
+TABLE_FORMAT = 2
+
+
+def grammarHash(rules, startSymbol):
+    payload = json.dumps([TABLE_FORMAT, startSymbol, list(rules.items())])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
 class Grammar:
     def __init__(self, rules):
         self.rules = rules
@@ -36,75 +55,200 @@ class Grammar:
         return tokens
 
 class FirstFollow:
+    # FIRST, FOLLOW and nullable are solved together by one worklist over the
+    # symbol dependency graph. Sets are int bitsets over terminal ids, stored in
+    # lists indexed by nonterminal id; "ε" only appears in decoded results.
     def __init__(self, grammar:Grammar):
         self.grammar = grammar
         self.first = {nonTerminal: set() for nonTerminal in grammar.rules}
         self.follow = {nonTerminal: set() for nonTerminal in grammar.rules}
+        self.computed = False
+
+    def computeSets(self):
+        rules = self.grammar.rules
+        self.nonTerminalIds = {nonTerminal: i for i, nonTerminal in enumerate(rules)}
+        terminals = sorted({
+            symbol
+            for productions in rules.values()
+            for production in productions
+            for symbol in production
+            if symbol not in rules
+        })
+        self.terminals = terminals + ["$"]
+        self.terminalBits = {terminal: 1 << i for i, terminal in enumerate(self.terminals)}
+        self.decoded = {}
+        self.sequences = {}
+        count = len(rules)
+        self.firstBits = [0] * count
+        self.followBits = [0] * count
+        self.nullable = [False] * count
+
+        ids = self.nonTerminalIds
+        productions = [
+            (ids[head], [ids.get(symbol, symbol) for symbol in production])
+            for head, prodList in rules.items()
+            for production in prodList
+        ]
+        byHead = [[] for _ in range(count)]
+        occurrences = [[] for _ in range(count)]
+        firstUsers = [set() for _ in range(count)]
+        followUsers = [set() for _ in range(count)]
+        for head, body in productions:
+            byHead[head].append(body)
+            for i, symbol in enumerate(body):
+                if symbol.__class__ is int:
+                    occurrences[symbol].append((head, body, i))
+                    firstUsers[symbol].add(("first", head))
+                    followUsers[head].add(("follow", symbol))
+                    for earlier in body[:i]:
+                        if earlier.__class__ is int:
+                            firstUsers[symbol].add(("follow", earlier))
+        if self.grammar.symbol in ids:
+            self.followBits[ids[self.grammar.symbol]] = self.terminalBits["$"]
+
+        pending = deque([("first", i) for i in range(count)] + [("follow", i) for i in range(count)])
+        queued = set(pending)
+        while pending:
+            node = pending.popleft()
+            queued.discard(node)
+            kind, symbol = node
+            if kind == "first":
+                bits, nullable = self.firstBits[symbol], self.nullable[symbol]
+                for body in byHead[symbol]:
+                    bodyBits, bodyNullable = self.sequenceBits(body)
+                    bits |= bodyBits
+                    nullable = nullable or bodyNullable
+                if bits == self.firstBits[symbol] and nullable == self.nullable[symbol]:
+                    continue
+                self.firstBits[symbol], self.nullable[symbol] = bits, nullable
+                dependents = firstUsers[symbol]
+            else:
+                bits = self.followBits[symbol]
+                for head, body, i in occurrences[symbol]:
+                    restBits, restNullable = self.sequenceBits(body[i + 1:])
+                    bits |= restBits
+                    if restNullable:
+                        bits |= self.followBits[head]
+                if bits == self.followBits[symbol]:
+                    continue
+                self.followBits[symbol] = bits
+                dependents = followUsers[symbol]
+            for dependent in dependents:
+                if dependent not in queued:
+                    queued.add(dependent)
+                    pending.append(dependent)
+        self.computed = True
+
+    def sequenceBits(self, symbols):
+        bits = 0
+        for symbol in symbols:
+            if symbol.__class__ is not int:
+                return bits | self.terminalBits[symbol], False
+            bits |= self.firstBits[symbol]
+            if not self.nullable[symbol]:
+                return bits, False
+        return bits, True
+
+    def decode(self, bits, nullable=False):
+        key = (bits, nullable)
+        names = self.decoded.get(key)
+        if names is None:
+            names = {self.terminals[i] for i in range(bits.bit_length()) if bits >> i & 1}
+            if nullable:
+                names.add("ε")
+            names = self.decoded[key] = frozenset(names)
+        return names
+
     def computeFirst(self):
         for nonTerminal in self.grammar.rules:
-            self.first[nonTerminal] = self.firstOf(nonTerminal)
+            self.first[nonTerminal] = set(self.firstOf(nonTerminal))
+
     def firstOf(self,symbol):
-        if symbol not in self.grammar.rules:
+        if not self.computed:
+            self.computeSets()
+        symbolId = self.nonTerminalIds.get(symbol)
+        if symbolId is None:
             return {symbol}
-        firstSet = set()
-        for production in self.grammar.rules[symbol]:
-            for prodSymbol in production:
-                subFirst = self.firstOf(prodSymbol)
-                firstSet.update(subFirst - {"ε"})
-                if "ε" not in subFirst:
-                    break
-            else:
-                subFirst.add("ε")
-        return firstSet
+        return self.decode(self.firstBits[symbolId], self.nullable[symbolId])
 
     def computeFollow(self):
-        self.follow[self.grammar.symbol].add("ε")
-        while True:
-            updated = True
-            for nonTerminals, productions in self.grammar.rules.items():
-                for production in productions:
-                    for i, symbol in enumerate(production):
-                        if symbol in self.grammar.rules:
-                            rest = production[i + 1:]
-                            restFirst = self.computeFirstOfString(rest)
-                            beforeUpdate = len(self.follow[symbol])
-                            self.follow[symbol].update(restFirst - "ε")
-                            if "ε" in restFirst:
-                                self.follow[symbol].update(self.follow[nonTerminals])
-                            if len(self.follow[symbol]) > beforeUpdate:
-                                updated = True
-            if not updated:
-                break
-
+        if not self.computed:
+            self.computeSets()
+        for nonTerminal, symbolId in self.nonTerminalIds.items():
+            self.follow[nonTerminal] = set(self.decode(self.followBits[symbolId]))
 
     def computeFirstOfString(self, symbols):
-        result = set()
-        for symbol in symbols:
-            subFirst = self.firstOf(symbol)
-            result.update(subFirst - {"ε"})
-            if "ε" not in subFirst:
-                return result
-        result.add("ε")
+        if not self.computed:
+            self.computeSets()
+        key = tuple(symbols)
+        result = self.sequences.get(key)
+        if result is None:
+            ids = self.nonTerminalIds
+            bits, nullable = self.sequenceBits([ids.get(symbol, symbol) for symbol in key])
+            result = self.sequences[key] = self.decode(bits, nullable)
         return result
-    
+
 
 
 class ParsingTable:
+    tableKind = "lr1"
+
     def __init__(self,grammar: Grammar) :
         self.grammar = grammar
         self.actionTable ={}
         self.gotoTable = {}
         self.states = []
         self.transitions = {}
+        self.itemIds = {}
+        self.stateIds = {}
+        self.firstFollow = FirstFollow(grammar)
+        self.firstOf = self.firstFollow.firstOf
 
-    def constructTable(self):
-        augmentedStart = f"{self.grammar.start_symbol}'"
-        self.grammar.addRules(augmentedStart, [self.grammar.symbol])
+    def augmentGrammar(self):
+        startSymbol = self.grammar.symbol
+        augmentedStart = f"{startSymbol}'"
+        self.grammar.addRules(augmentedStart, [startSymbol])
         self.grammar.setStartSymbol(augmentedStart)
+        return startSymbol, augmentedStart
 
-        startItem = (augmentedStart, ["." + self.grammar.symbol], "$")
-        initialState = self.closure([startItem])
-        self.states.append(initialState)
+    def constructCachedTable(self, cacheDir=None):
+        # The ACTION/GOTO tables and any recorded conflicts are cached; states
+        # and transitions stay empty when the tables come from disk.
+        if cacheDir is None:
+            cacheDir = os.environ.get("LR_TABLE_CACHE_DIR") or TABLE_CACHE_DIR
+        digest = grammarHash(self.grammar.rules, self.grammar.symbol)
+        path = os.path.join(cacheDir, f"{self.tableKind}-{digest}.tbl")
+        try:
+            with open(path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    self.actionTable, self.gotoTable, conflicts = marshal.loads(buffer)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.constructTable()
+            self.saveTables(cacheDir, path)
+        else:
+            if conflicts is not None:
+                self.conflicts = conflicts
+            self.augmentGrammar()
+
+    def saveTables(self, cacheDir, path):
+        # An unwritable cache only costs the next run a rebuild.
+        temporaryPath = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(cacheDir, exist_ok=True)
+            with open(temporaryPath, "wb") as file:
+                marshal.dump((self.actionTable, self.gotoTable, getattr(self, "conflicts", None)), file)
+            os.replace(temporaryPath, path)
+        except OSError:
+            try:
+                os.remove(temporaryPath)
+            except OSError:
+                pass
+
+    def constructTable(self):
+        startSymbol, augmentedStart = self.augmentGrammar()
+
+        startItem = (augmentedStart, (".", startSymbol), "$")
+        self.registerState([startItem])
 
         self.buildStates()
 
@@ -117,61 +261,242 @@ class ParsingTable:
                 if symbol in self.grammar.rules:
                     self.gotoTable[i][symbol] = targetState
                 else:
-                     self.gotoTable[i][symbol] = ("shift", targetState)
+                    self.actionTable[i][symbol] = ("shift", targetState)
             for item in state:
                 head, body, lookahead = item
-                if "." in body and body[-1] == ".":
+                if body[-1] == ".":
                     if head == augmentedStart:
                         self.actionTable[i]["$"] = ("accept", None)
                     else:
-                        productionIndex = self.grammar.rules[head].index(body[:-1])
+                        productionIndex = self.grammar.rules[head].index(list(body[:-1]))
                         self.actionTable[i][lookahead] = ("reduce", (head, productionIndex))
     def closure(self, items):
         closureSet = set(items)
-        while True:
-            newItem =set()
-            for body, lookahead in closureSet:
-                dotPosition = body.index('.')
-                if dotPosition < len(body) -1:
-                    nextSymbol = body[dotPosition + 1]
-                    if nextSymbol in self.grammar.rules:
-                        for production in self.grammar.rules[nextSymbol]:
-                            for la in self.firstOfString(body[dotPosition + 2 : ] + [lookahead]):
-                                newItem = (nextSymbol, ["." + production], la)
-                                if newItem not in closureSet:
-                                    closureSet.add(newItem)
-            if not newItem:
-                break
-            closureSet.update(newItem)
+        pending = list(closureSet)
+        while pending:
+            head, body, lookahead = pending.pop()
+            dotPosition = body.index('.')
+            if dotPosition < len(body) - 1:
+                nextSymbol = body[dotPosition + 1]
+                if nextSymbol in self.grammar.rules:
+                    lookaheads = self.firstOfString(body[dotPosition + 2:])
+                    if "ε" in lookaheads:
+                        lookaheads = (lookaheads - {"ε"}) | {lookahead}
+                    for production in self.grammar.rules[nextSymbol]:
+                        for la in lookaheads:
+                            newItem = (nextSymbol, (".",) + tuple(production), la)
+                            if newItem not in closureSet:
+                                closureSet.add(newItem)
+                                pending.append(newItem)
         return closureSet
     
     def firstOfString(self, symbols):
-        firstSet = set()
-        for symbol in symbols:
-            subFirst = self.firstOf(symbol)
-            firstSet.update(subFirst - {"ε"})
-            if "ε" not in subFirst:
-                break
-            else:
-                firstSet.add("ε")
-        return firstSet
+        return self.firstFollow.computeFirstOfString(symbols)
+
+    def registerState(self, kernel):
+        # States are keyed by their kernel as a sorted tuple of interned item
+        # ids, so dedup and id lookup are one dict probe and a kernel that is
+        # already known is never closed again.
+        itemIds = self.itemIds
+        ids = []
+        for item in kernel:
+            itemId = itemIds.get(item)
+            if itemId is None:
+                itemId = itemIds[item] = len(itemIds)
+            ids.append(itemId)
+        key = tuple(sorted(ids))
+        stateId = self.stateIds.get(key)
+        if stateId is None:
+            stateId = self.stateIds[key] = len(self.states)
+            self.states.append(self.closure(kernel))
+        return stateId
 
     def buildStates(self):
         for i, state in enumerate(self.states):
             self.transitions[i] = {}
-            symbols = {body[body.index(".") + 1] for _, body, _ in state if "." in body[:-1]}
-            for symbol in symbols:
-                newItems = set()
-                for head, body, lookahead in state:
-                    dotPosition = body.index('.')
-                    if dotPosition <  len(body) -1 and body[dotPosition + 1]== symbol:
-                        newItem = (head, body[:dotPosition] + [symbol, "."]  + body[dotPosition + 2:], lookahead)
-                        newItems.add(newItem)
-            closureSet = self.closure(newItems)
-            if closureSet not in self.states:
-                self.states.append(closureSet)
-            self.transitions[i][symbol] = self.states.index(closureSet)
+            kernels = {}
+            for head, body, lookahead in state:
+                dotPosition = body.index('.')
+                if dotPosition < len(body) - 1:
+                    symbol = body[dotPosition + 1]
+                    newItem = (head, body[:dotPosition] + (symbol, ".") + body[dotPosition + 2:], lookahead)
+                    kernels.setdefault(symbol, []).append(newItem)
+            for symbol, kernel in kernels.items():
+                self.transitions[i][symbol] = self.registerState(kernel)
+
+
+
+def digraph(nodes, relation, base):
+    # DeRemer-Pennello digraph: F(x) = base(x) united with F(y) for every y
+    # reachable from x, collapsing strongly connected components. Iterative so
+    # long relation chains cannot hit the recursion limit.
+    infinity = len(nodes) + 1
+    order = {}
+    lowLink = {}
+    result = {}
+    stack = []
+    for root in nodes:
+        if root in order:
+            continue
+        order[root] = lowLink[root] = len(stack) + 1
+        stack.append(root)
+        result[root] = set(base.get(root, ()))
+        work = [(root, iter(relation.get(root, ())))]
+        while work:
+            node, edges = work[-1]
+            for neighbour in edges:
+                if neighbour not in order:
+                    order[neighbour] = lowLink[neighbour] = len(stack) + 1
+                    stack.append(neighbour)
+                    result[neighbour] = set(base.get(neighbour, ()))
+                    work.append((neighbour, iter(relation.get(neighbour, ()))))
+                    break
+                lowLink[node] = min(lowLink[node], lowLink[neighbour])
+                result[node] |= result[neighbour]
+            else:
+                work.pop()
+                if lowLink[node] == order[node]:
+                    while True:
+                        member = stack.pop()
+                        lowLink[member] = infinity
+                        result[member] = result[node]
+                        if member == node:
+                            break
+                if work:
+                    parent = work[-1][0]
+                    lowLink[parent] = min(lowLink[parent], lowLink[node])
+                    result[parent] |= result[node]
+    return result
+
+
+class LALRParsingTable(ParsingTable):
+    # Builds the LR(0) automaton and attaches LALR(1) lookaheads with
+    # DeRemer-Pennello propagation, so no canonical LR(1) states are created.
+    tableKind = "lalr1"
+
+    def __init__(self, grammar: Grammar):
+        super().__init__(grammar)
+        self.conflicts = []
+
+    def constructTable(self):
+        startSymbol, augmentedStart = self.augmentGrammar()
+        rules = self.grammar.rules
+        self.productions = [
+            (head, tuple(production))
+            for head, productions in rules.items()
+            for production in productions
+        ]
+        self.buildLR0States(augmentedStart)
+
+        nullable = self.nullableSymbols()
+        nonTerminalEdges = [
+            (state, symbol)
+            for state, edges in self.transitions.items()
+            for symbol in edges
+            if symbol in rules
+        ]
+        directReads = {}
+        reads = {}
+        for state, symbol in nonTerminalEdges:
+            target = self.transitions[state][symbol]
+            directReads[(state, symbol)] = {
+                terminal for terminal in self.transitions[target] if terminal not in rules
+            }
+            reads[(state, symbol)] = [
+                (target, nextSymbol)
+                for nextSymbol in self.transitions[target]
+                if nextSymbol in nullable
+            ]
+        directReads[(0, startSymbol)].add("$")
+        readSets = digraph(nonTerminalEdges, reads, directReads)
+
+        includes = {}
+        lookback = {}
+        for state, head in nonTerminalEdges:
+            for productionIndex, production in enumerate(rules[head]):
+                current = state
+                for position, symbol in enumerate(production):
+                    if symbol in rules and all(rest in nullable for rest in production[position + 1:]):
+                        includes.setdefault((current, symbol), []).append((state, head))
+                    current = self.transitions[current][symbol]
+                lookback.setdefault((current, head, productionIndex), []).append((state, head))
+        followSets = digraph(nonTerminalEdges, includes, readSets)
+
+        for i in range(len(self.states)):
+            self.actionTable[i] = {}
+            self.gotoTable[i] = {}
+            for symbol, target in self.transitions[i].items():
+                if symbol in rules:
+                    self.gotoTable[i][symbol] = target
+                else:
+                    self.actionTable[i][symbol] = ("shift", target)
+        self.setAction(self.transitions[0][startSymbol], "$", ("accept", None))
+        for (state, head, productionIndex), edges in sorted(lookback.items(), key=lambda entry: entry[0][2]):
+            lookaheads = set().union(*(followSets[edge] for edge in edges))
+            for lookahead in sorted(lookaheads):
+                self.setAction(state, lookahead, ("reduce", (head, productionIndex)))
+
+    def setAction(self, state, terminal, action):
+        existing = self.actionTable[state].get(terminal)
+        if existing is None:
+            self.actionTable[state][terminal] = action
+        elif existing != action:
+            kind = "shift/reduce" if existing[0] == "shift" else "reduce/reduce"
+            self.conflicts.append((kind, state, terminal, existing, action))
 
+    def conflictReport(self):
+        return [
+            f"{kind} conflict in state {state} on '{terminal}': {existing} vs {action}"
+            for kind, state, terminal, existing, action in self.conflicts
+        ]
+
+    def nullableSymbols(self):
+        nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for head, production in self.productions:
+                if head not in nullable and all(symbol in nullable for symbol in production):
+                    nullable.add(head)
+                    changed = True
+        return nullable
+
+    def buildLR0States(self, augmentedStart):
+        # LR(0) items are (productionId, dotPosition) over self.productions.
+        startItems = {}
+        for productionId, (head, _) in enumerate(self.productions):
+            startItems.setdefault(head, []).append((productionId, 0))
+
+        def closure(kernel):
+            closureSet = set(kernel)
+            pending = list(kernel)
+            while pending:
+                productionId, dotPosition = pending.pop()
+                production = self.productions[productionId][1]
+                if dotPosition < len(production):
+                    for item in startItems.get(production[dotPosition], ()):
+                        if item not in closureSet:
+                            closureSet.add(item)
+                            pending.append(item)
+            return closureSet
+
+        startKernel = frozenset(startItems[augmentedStart])
+        registry = {startKernel: 0}
+        self.states = [closure(startKernel)]
+        for i, state in enumerate(self.states):
+            kernels = {}
+            for productionId, dotPosition in state:
+                production = self.productions[productionId][1]
+                if dotPosition < len(production):
+                    kernels.setdefault(production[dotPosition], set()).add((productionId, dotPosition + 1))
+            self.transitions[i] = {}
+            for symbol, kernel in kernels.items():
+                kernel = frozenset(kernel)
+                target = registry.get(kernel)
+                if target is None:
+                    target = registry[kernel] = len(self.states)
+                    self.states.append(closure(kernel))
+                self.transitions[i][symbol] = target
 
 
 class LR1Parser:
@@ -186,16 +511,17 @@ class LR1Parser:
             state = stack[-1]
             token = tokens[index][0] if index < len(tokens) else "$"
             
-            if token in self.parsing_table.action_table[state]:
-                action = self.parsing_table.action_table[state][token]
+            if token in self.parsing_table.actionTable[state]:
+                action = self.parsing_table.actionTable[state][token]
                 if action[0] == "shift":
                     stack.append(action[1])
                     index += 1
                 elif action[0] == "reduce":
-                    production = self.grammar.rules[action[1]]
+                    head, productionIndex = action[1]
+                    production = self.grammar.rules[head][productionIndex]
                     for _ in range(len(production)):
                         stack.pop()
-                    goto_state = self.parsing_table.goto_table[stack[-1]][action[1]]
+                    goto_state = self.parsing_table.gotoTable[stack[-1]][head]
                     stack.append(goto_state)
                 elif action[0] == "accept":
                     print("Input successfully parsed!")
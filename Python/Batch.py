@@ -0,0 +1,162 @@
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+#! Batch driver: compiles many source files with the Main.py pipeline
+#! (tokenize -> Parser -> Optimizer -> Evaluator/CodeGenerator) across a
+#! process pool and streams one JSON record per file as chunks finish.
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Main.py')
+INSTRUMENTATION_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'compiler', 'instrumentation.py')
+
+compiler = None #! The pipeline module, loaded once per worker process
+recorder = None #! The worker's Instrumentation when profiling, else None
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def load_compiler():
+    return load_module('pipeline', MAIN_PATH)
+
+def load_instrumentation():
+    return load_module('instrumentation', INSTRUMENTATION_PATH)
+
+def init_worker(profile=False, trace_memory=False):
+    global compiler, recorder
+    compiler = load_compiler()
+    if profile:
+        recorder = load_instrumentation().Instrumentation(trace_memory).attach(compiler)
+
+
+def compile_source(source):
+    factory = compiler.NodeFactory()
+    program = compiler.Optimizer(factory).optimize(compiler.parse_program(source, factory))
+    evaluator = compiler.Evaluator()
+    generator = compiler.CodeGenerator()
+    lines = []
+    for statement in program:
+        evaluator.evaluate(statement)
+        lines.append(generator.generate(statement))
+    return {'code': '\n'.join(lines), 'environment': evaluator.environment}
+
+def compile_file(path):
+    try:
+        with open(path, encoding='utf-8') as source:
+            return {'path': path, 'ok': True, **compile_source(source.read())}
+    except Exception as error:
+        return {'path': path, 'ok': False, 'error': f'{type(error).__name__}: {error}'}
+
+def compile_chunk(paths):
+    #! Workers read the files themselves; only paths, results and, when
+    #! profiling, the chunk's instrumentation snapshot cross the pipe.
+    records = [compile_file(path) for path in paths]
+    if recorder is None:
+        return records, None
+    snapshot = recorder.snapshot()
+    recorder.reset()
+    return records, snapshot
+
+
+def discover(target, suffix=''):
+    #! A directory is walked for files ending in `suffix`; any other file is a
+    #! manifest listing one source path per line, relative to the manifest.
+    if os.path.isdir(target):
+        for root, dirs, files in os.walk(target):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(suffix):
+                    yield os.path.join(root, name)
+        return
+    base = os.path.dirname(os.path.abspath(target))
+    with open(target, encoding='utf-8') as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield os.path.join(base, line)
+
+def chunked(paths, size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def compile_batch(paths, output, workers=None, chunk_size=64, profile=None):
+    #! At most two chunks per worker are in flight, so a huge manifest is never
+    #! materialized and records are written as soon as their chunk completes.
+    #! `profile` is an Instrumentation that collects every worker's phase stats.
+    workers = workers or os.cpu_count() or 1
+    stats = {'files': 0, 'errors': 0}
+    started = time.perf_counter()
+    chunks = chunked(paths, chunk_size)
+    initargs = (profile is not None, profile is not None and profile.trace_memory)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=initargs) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(compile_chunk, chunk))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write_records(done, output, stats, profile)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            write_records(done, output, stats, profile)
+    stats['seconds'] = time.perf_counter() - started
+    stats['files_per_second'] = stats['files'] / stats['seconds'] if stats['seconds'] else 0.0
+    stats['workers'] = workers
+    return stats
+
+def write_records(futures, output, stats, profile=None):
+    for future in futures:
+        records, snapshot = future.result()
+        if snapshot is not None:
+            profile.merge(snapshot)
+        for record in records:
+            stats['files'] += 1
+            stats['errors'] += not record['ok']
+            output.write(json.dumps(record) + '\n')
+    output.flush()
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Compile many source files in parallel.')
+    arguments.add_argument('target', help='directory of sources or a manifest file')
+    arguments.add_argument('-o', '--output', help='JSON lines output (default: stdout)')
+    arguments.add_argument('-j', '--jobs', type=int, default=None, help='worker processes')
+    arguments.add_argument('--chunk-size', type=int, default=64, help='files per task')
+    arguments.add_argument('--suffix', default='', help='only compile files ending with this')
+    arguments.add_argument('--profile', help='write per-phase timing, counters and cache stats here')
+    arguments.add_argument('--profile-format', choices=('json', 'prometheus'), default='json')
+    arguments.add_argument('--trace-memory', action='store_true', help='also record allocations per phase (slower)')
+    options = arguments.parse_args(argv)
+
+    paths = discover(options.target, options.suffix)
+    profile = load_instrumentation().Instrumentation(options.trace_memory) if options.profile else None
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as output:
+            stats = compile_batch(paths, output, options.jobs, options.chunk_size, profile)
+    else:
+        stats = compile_batch(paths, sys.stdout, options.jobs, options.chunk_size, profile)
+    if profile is not None:
+        with open(options.profile, 'w', encoding='utf-8') as report:
+            report.write(profile.to_prometheus() if options.profile_format == 'prometheus' else profile.to_json(indent=2))
+    print(f"{stats['files']} files, {stats['errors']} errors in {stats['seconds']:.2f}s "
+          f"({stats['files_per_second']:.0f} files/s on {stats['workers']} workers)", file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
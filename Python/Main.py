@@ -1,4 +1,8 @@
+import heapq
 import re
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
 
 
 # Lexical Analysis (Tokenization)
@@ -10,21 +14,166 @@ token_specification = [
     ('OP',r'[+\-*/]'), #! Operators
     ('LPAREN', r'\('),          #! Left Parenthesis
     ('RPAREN', r'\)'),          #! Right Parenthesis
-    ('WHITESPACE',r'[ \t]+'), #! Whitespace
+    ('NEWLINE',r'\n'), #! Line break
+    ('WHITESPACE',r'[ \t\r]+'), #! Whitespace
     ('MISMATCH',r'.'), #! Any other character
 ]
 
 token_regex = "|".join(f"(?P<{name}>{pattern})" for name, pattern in token_specification)
+token_pattern = re.compile(token_regex)
+token_kinds = [name for name, _ in token_specification]
+kind_ids = {name: i for i, name in enumerate(token_kinds)}
+group_kinds = [None] * (token_pattern.groups + 1)
+for name, group in token_pattern.groupindex.items():
+    group_kinds[group] = kind_ids[name]
+(KIND_NUMBER, KIND_ASSIGN, KIND_END, KIND_ID, KIND_OP, KIND_LPAREN, KIND_RPAREN,
+ KIND_NEWLINE, KIND_WHITESPACE, KIND_MISMATCH) = range(len(token_kinds))
+
+Token = namedtuple('Token', ['kind', 'value', 'line', 'column'])
+
+instrumentation = None #! Recorder from compiler/instrumentation.py; None keeps every hook to one check
+
+def set_instrumentation(recorder):
+    global instrumentation
+    instrumentation = recorder
 
 def tokenize(code):
-    for match in re.finditer(token_regex, code):
+    line, line_start = 1, 0
+    for match in token_pattern.finditer(code):
         kind = match.lastgroup
-        value = match.group(kind)
         if kind == 'WHITESPACE':
             continue
-        elif kind == 'MISMATCH':
-            raise RuntimeError(f"f'Unexpected character {value}")
-        yield kind, value
+        elif kind == 'NEWLINE':
+            line += 1
+            line_start = match.end()
+            continue
+        value = match.group()
+        column = match.start() - line_start + 1
+        if kind == 'MISMATCH':
+            raise RuntimeError(f"Unexpected character {value!r} at line {line}, column {column}")
+        yield Token(kind, value, line, column)
+
+
+def read_chunks(source, chunk_size):
+    if hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def tokenize_stream(source, chunk_size=1 << 16):
+    #! source is a text file object or any iterable of string chunks. A match
+    #! that touches the end of the buffer may continue in the next chunk, so it
+    #! is carried over instead of emitted; only that tail is kept in memory.
+    chunks = read_chunks(source, chunk_size)
+    buffer = ''
+    offset = 0
+    line, line_start = 1, 0
+    at_end = False
+    while not at_end:
+        chunk = next(chunks, None)
+        if chunk is None:
+            at_end = True
+        else:
+            buffer += chunk
+        consumed = 0
+        for match in token_pattern.finditer(buffer):
+            if not at_end and match.end() == len(buffer):
+                break
+            consumed = match.end()
+            kind = match.lastgroup
+            if kind == 'WHITESPACE':
+                continue
+            elif kind == 'NEWLINE':
+                line += 1
+                line_start = offset + consumed
+                continue
+            value = match.group()
+            column = offset + match.start() - line_start + 1
+            if kind == 'MISMATCH':
+                raise RuntimeError(f"Unexpected character {value!r} at line {line}, column {column}")
+            yield Token(kind, value, line, column)
+        buffer = buffer[consumed:]
+        offset += consumed
+
+
+class TokenBuffer:
+    #! Kinds are small ints in an array('B') and lexemes are (start, end)
+    #! offsets into the source, sliced only when text() is asked for.
+    def __init__(self, source=''):
+        self.init_fields(source)
+        if instrumentation is None:
+            self.scan(source)
+        else:
+            with instrumentation.phase('tokenize'):
+                self.scan(source)
+            instrumentation.count('tokens', len(self.kinds))
+
+    def init_fields(self, source):
+        self.source = source
+        self.values = None
+        self.kinds = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.line_starts = None
+
+    def scan(self, source):
+        kinds_append, starts_append, ends_append = self.kinds.append, self.starts.append, self.ends.append
+        for match in token_pattern.finditer(source):
+            kind = group_kinds[match.lastindex]
+            if kind == KIND_WHITESPACE or kind == KIND_NEWLINE:
+                continue
+            if kind == KIND_MISMATCH:
+                line, column = self.position_of(match.start())
+                raise RuntimeError(f"Unexpected character {match.group()!r} at line {line}, column {column}")
+            kinds_append(kind)
+            starts_append(match.start())
+            ends_append(match.end())
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        #! Skips __init__, which would record an empty tokenize pass of its own.
+        buffer = cls.__new__(cls)
+        buffer.init_fields('')
+        buffer.values = []
+        if instrumentation is None:
+            buffer.collect(tokens)
+        else:
+            #! Lazy token streams do their scanning here, as they are consumed.
+            with instrumentation.phase('tokenize'):
+                buffer.collect(tokens)
+            instrumentation.count('tokens', len(buffer.kinds))
+        return buffer
+
+    def collect(self, tokens):
+        for token in tokens:
+            self.kinds.append(kind_ids[token[0]])
+            self.values.append(token[1])
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        return token_kinds[self.kinds[index]], self.text(index)
+
+    def text(self, index):
+        if self.values is not None:
+            return self.values[index]
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def position_of(self, offset):
+        if self.line_starts is None:
+            self.line_starts = array('I', [0])
+            self.line_starts.extend(match.end() for match in re.finditer('\n', self.source))
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def position(self, index):
+        return self.position_of(self.starts[index])
 
 
 # code = " x =    20 + 10;"
@@ -35,21 +184,36 @@ def tokenize(code):
 
 #! Step 2: Syntax Analysis (Parsing)
 
+#! `constant` marks subtrees that read no variables; their value never
+#! changes, so back ends may cache it per node.
 class NumberNode:
+    __slots__ = ('value',)
+    constant = True
     def __init__(self, value):
          self.value = value
     def __repr__(self):
         return f"NumberNode(value={self.value})"
+
+class VariableNode:
+    __slots__ = ('name',)
+    constant = False
+    def __init__(self, name):
+        self.name = name
+    def __repr__(self):
+        return f"VariableNode(name={self.name})"
         
 class BinOpNode:
+    __slots__ = ('left', 'operator', 'right', 'constant')
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
         self.right = right
+        self.constant = left.constant and right.constant
     def __repr__(self):
         return f"BinOpNode(left={self.left}, operator='{self.operator}', right={self.right})"
 
 class AssignNode:
+    __slots__ = ('variable', 'value')
     def __init__(self, variable, value):
         self.variable = variable
         self.value = value
@@ -57,6 +221,7 @@ class AssignNode:
         return f"AssignNode({self.variable} = {self.value})"
     
 class IfNode:
+    __slots__ = ('condition', 'true_branch', 'false_branch')
     def __init__(self, condition, true_branch, false_branch=None):
         self.condition = condition
         self.true_branch = true_branch
@@ -65,51 +230,145 @@ class IfNode:
         return f"IfNode(condition={self.condition}, true_branch={self.true_branch}, false_branch={self.false_branch})"
 
 
+class NodeFactory:
+    #! Hash-consing: children are already canonical, so a node's identity key
+    #! is its fields and structurally equal subtrees come back as one object.
+    def __init__(self):
+        self.nodes = {}
+
+    def number(self, value):
+        key = (NumberNode, value)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = NumberNode(value)
+        return node
+
+    def variable(self, name):
+        key = (VariableNode, name)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = VariableNode(name)
+        return node
+
+    def binop(self, left, operator, right):
+        key = (left, operator, right)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = BinOpNode(left, operator, right)
+        return node
+
+    def assign(self, variable, value):
+        key = (AssignNode, variable, value)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = AssignNode(variable, value)
+        return node
+
+
+operator_precedence = {'+': 1, '-': 1, '*': 2, '/': 2}
+
 class Parser:
-    def __init__(self, tokens) -> None:
+    def __init__(self, tokens, factory=None) -> None:
+        if not isinstance(tokens, TokenBuffer):
+            tokens = TokenBuffer.from_tokens(tokens)
         self.tokens = tokens
+        self.kinds = tokens.kinds
+        self.count = len(tokens.kinds)
+        self.text = tokens.text
+        self.factory = factory if factory is not None else NodeFactory()
         self.pos = 0
     def parse(self):
-        return self.assignment()
+        if instrumentation is None:
+            return self.assignment()
+        with instrumentation.phase('parse'):
+            return self.measure_nodes(self.assignment)
+
+    def parse_program(self):
+        if instrumentation is None:
+            return self.statements()
+        with instrumentation.phase('parse'):
+            return self.measure_nodes(self.statements)
+
+    def measure_nodes(self, parse):
+        #! Counts statements and the nodes newly interned while parsing them.
+        interned = len(self.factory.nodes)
+        result = parse()
+        instrumentation.count('statements', len(result) if isinstance(result, list) else 1)
+        instrumentation.count('nodes', len(self.factory.nodes) - interned)
+        return result
+
+    def statements(self):
+        statements = []
+        append = statements.append
+        while self.pos < self.count:
+            append(self.assignment())
+        return statements
+
     def assignment(self):
-        variable = self.consume('ID')
-        self.consume('ASSIGN')
+        variable = self.consume(KIND_ID)
+        self.expect(KIND_ASSIGN)
         value = self.expr()
-        self.consume('END')
-        return AssignNode(variable, value)
+        self.expect(KIND_END)
+        return self.factory.assign(variable, value)
     
-    def expr(self):
+    def expr(self, min_precedence=1):
+        #! Precedence climbing: operands of a tighter operator are parsed by
+        #! the recursive call, equal precedence folds left.
         left = self.term()
-        while self.match('OP'):
-            op = self.consume('OP')
-            right = self.term()
-            left = BinOpNode(left, op, right)
+        kinds = self.kinds
+        while self.pos < self.count and kinds[self.pos] == KIND_OP:
+            op = self.text(self.pos)
+            precedence = operator_precedence[op]
+            if precedence < min_precedence:
+                break
+            self.pos += 1
+            right = self.expr(precedence + 1)
+            left = self.factory.binop(left, op, right)
         return left
     
     def term(self):
-        if self.match('NUMBER'):
-            return NumberNode(self.consume("NUMBER"))
-        elif self.match('LPAREN'):
-            self.consume('LPAREN')  
+        if self.match(KIND_NUMBER):
+            return self.factory.number(self.consume(KIND_NUMBER))
+        elif self.match(KIND_ID):
+            return self.factory.variable(self.consume(KIND_ID))
+        elif self.match(KIND_LPAREN):
+            self.expect(KIND_LPAREN)
             expr = self.expr()  
-            self.consume('RPAREN') 
+            self.expect(KIND_RPAREN)
             return expr
         else:
             raise RuntimeError("Unexpected token")
         
     def consume(self, expected_type):
-        token_type, token_value = self.tokens[self.pos]
-        if token_type == expected_type:
-            self.pos += 1
-            return token_value
-        raise RuntimeError(f'Expected {expected_type}, got {token_type}')
+        pos = self.pos
+        if pos < self.count and self.kinds[pos] == expected_type:
+            self.pos = pos + 1
+            return self.text(pos)
+        self.unexpected(expected_type)
+
+    def expect(self, expected_type):
+        pos = self.pos
+        if pos < self.count and self.kinds[pos] == expected_type:
+            self.pos = pos + 1
+            return
+        self.unexpected(expected_type)
+
+    def unexpected(self, expected_type):
+        found = token_kinds[self.kinds[self.pos]] if self.pos < self.count else 'end of input'
+        raise RuntimeError(f'Expected {token_kinds[expected_type]}, got {found}')
     
     def match(self, expected_type):
-        if self.pos < len(self.tokens) and self.tokens[self.pos][0] == expected_type:
-            return True
-        return False
+        return self.pos < self.count and self.kinds[self.pos] == expected_type
     
 
+def parse_program(source, factory=None):
+    if hasattr(source, 'read'):
+        tokens = TokenBuffer.from_tokens(tokenize_stream(source))
+    else:
+        tokens = TokenBuffer(source)
+    return Parser(tokens, factory).parse_program()
+
+
 # code = "x = 10 + 20;"
 # tokens = list(tokenize(code))
 # parser = Parser(tokens)
@@ -118,24 +377,191 @@ class Parser:
 
 
 
+#! Step 2b: Optimization (constant folding and algebraic simplification)
+
+def number_value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def count_nodes(node):
+    count = 0
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        count += 1
+        if isinstance(node, BinOpNode):
+            pending.append(node.left)
+            pending.append(node.right)
+        elif isinstance(node, AssignNode):
+            pending.append(node.value)
+    return count
+
+class Optimizer:
+    def __init__(self, factory=None):
+        self.factory = factory if factory is not None else NodeFactory()
+        self.stats = {'folded': 0, 'simplified': 0, 'nodes_before': 0, 'nodes_after': 0, 'nodes_removed': 0}
+        #! Static int/float types: variables by the assignments seen so far,
+        #! operator nodes per statement (an interned node's type depends on
+        #! the variable types at that point). None means unknown.
+        self.variable_types = {}
+        self.node_types = {}
+
+    def optimize(self, node):
+        if instrumentation is not None:
+            with instrumentation.phase('optimize'):
+                return self.optimize_node(node)
+        return self.optimize_node(node)
+
+    def optimize_node(self, node):
+        if isinstance(node, list):
+            return [self.optimize_node(statement) for statement in node]
+        before = count_nodes(node)
+        if isinstance(node, AssignNode):
+            try:
+                value = self.optimize_expression(node.value)
+            except ZeroDivisionError:
+                raise ZeroDivisionError(f"Division by zero in assignment to {node.variable}") from None
+            self.variable_types[node.variable] = self.numeric_type(value)
+            result = self.factory.assign(node.variable, value)
+        else:
+            result = self.optimize_expression(node)
+        after = count_nodes(result)
+        self.stats['nodes_before'] += before
+        self.stats['nodes_after'] += after
+        self.stats['nodes_removed'] += before - after
+        return result
+
+    def optimize_expression(self, node):
+        #! Post-order with an explicit stack: children are simplified first and
+        #! their results are popped off `results` when the parent is revisited.
+        results = []
+        pending = [(node, False)]
+        self.node_types.clear()
+        while pending:
+            node, visited = pending.pop()
+            if not isinstance(node, BinOpNode):
+                results.append(node)
+            elif visited:
+                right = results.pop()
+                left = results.pop()
+                result = self.simplify(node, left, right)
+                if isinstance(result, BinOpNode):
+                    self.node_types[result] = self.result_type(result.operator, left, right)
+                results.append(result)
+            else:
+                pending.append((node, True))
+                pending.append((node.right, False))
+                pending.append((node.left, False))
+        return results[0]
+
+    def simplify(self, node, left, right):
+        operator = node.operator
+        left_value = number_value(left.value) if isinstance(left, NumberNode) else None
+        right_value = number_value(right.value) if isinstance(right, NumberNode) else None
+        if operator == '/' and right_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if left_value is not None and right_value is not None:
+            self.stats['folded'] += 1
+            if operator == '+':
+                return self.factory.number(str(left_value + right_value))
+            elif operator == '-':
+                return self.factory.number(str(left_value - right_value))
+            elif operator == '*':
+                return self.factory.number(str(left_value * right_value))
+            elif operator == '/':
+                return self.factory.number(str(left_value / right_value))
+            raise RuntimeError(f"Unsupported operator: {operator}")
+        simplified = self.apply_identity(operator, left, left_value, right, right_value)
+        if simplified is not None:
+            self.stats['simplified'] += 1
+            return simplified
+        if left is node.left and right is node.right:
+            return node
+        return self.factory.binop(left, operator, right)
+
+    def apply_identity(self, operator, left, left_value, right, right_value):
+        #! x*1, 1*x, x-0 -> x for any x; x+0, 0+x -> x and x*0, 0*x -> 0 only
+        #! for an int x (-0.0+0 is 0.0, inf*0 is nan). Only int literals
+        #! count: x*1.0 or x*0.0 turn an int x into a float, and x/1 is left
+        #! alone for the same reason. Counted in stats['simplified'].
+        if type(left_value) is not int:
+            left_value = None
+        if type(right_value) is not int:
+            right_value = None
+        if operator == '+':
+            if left_value == 0 and self.numeric_type(right) is int:
+                return right
+            if right_value == 0 and self.numeric_type(left) is int:
+                return left
+        elif operator == '-':
+            if right_value == 0:
+                return left
+        elif operator == '*':
+            if left_value == 0 and self.numeric_type(right) is int:
+                return left
+            if right_value == 0 and self.numeric_type(left) is int:
+                return right
+            if left_value == 1:
+                return right
+            if right_value == 1:
+                return left
+        return None
+
+    def numeric_type(self, node):
+        if isinstance(node, NumberNode):
+            return type(number_value(node.value))
+        if isinstance(node, VariableNode):
+            return self.variable_types.get(node.name)
+        return self.node_types.get(node)
+
+    def result_type(self, operator, left, right):
+        left_type = self.numeric_type(left)
+        right_type = self.numeric_type(right)
+        if left_type is None or right_type is None:
+            return None
+        if operator == '/' or left_type is float or right_type is float:
+            return float
+        return int
+
+
 #! Step 3: Evaluation
 
 class Evaluator:
     def __init__(self):
         self.environment = {}
+        self.memo = {}
     def evaluate(self,node):
         if isinstance(node, NumberNode):
             return self.eval_number(node)
         elif isinstance(node, BinOpNode):
             return self.eval_binOp(node)
+        elif isinstance(node, VariableNode):
+            return self.eval_variable(node)
         elif isinstance(node, AssignNode):
             return self.eval_assign(node)
         else:
             raise RuntimeError(f"Unsupported node type: {type(node)}")
         
     def eval_number(self,node):
-        return int(node.value)
+        return number_value(node.value)
+    def eval_variable(self, node):
+        try:
+            return self.environment[node.name]
+        except KeyError:
+            raise RuntimeError(f"Undefined variable: {node.name}") from None
     def eval_binOp(self, node):
+        #! Nodes are hash-consed, so a shared subtree is computed only once;
+        #! only variable-free subtrees are cached, as reassignment changes the rest.
+        if not node.constant:
+            return self.compute_binOp(node)
+        value = self.memo.get(node)
+        if value is None:
+            value = self.memo[node] = self.compute_binOp(node)
+        return value
+
+    def compute_binOp(self, node):
         leftValue = self.evaluate(node.left)
         rightValue = self.evaluate(node.right)
         if node.operator == '+':
@@ -152,7 +578,13 @@ class Evaluator:
             raise RuntimeError(f"Unsupported operator: {node.operator}")
         
     def eval_assign(self, node):
-        value = self.evaluate(node.value)
+        #! Timed per statement: evaluate() itself recurses once per node.
+        if instrumentation is not None:
+            with instrumentation.phase('evaluate'):
+                value = self.evaluate(node.value)
+            instrumentation.count('evaluated_statements')
+        else:
+            value = self.evaluate(node.value)
         self.environment[node.variable] = value
         return value
     
@@ -169,44 +601,685 @@ class Evaluator:
 # print(f"Environment: {evaluator.environment}")
 
 
-#! Step 4: Code Generation to Python Code
+#! Step 3b: Bytecode Compilation and Stack VM
 
+#! Each instruction is one int: opcode in the low byte, argument above it.
+OP_CONST, OP_LOAD, OP_STORE, OP_ADD, OP_SUB, OP_MUL, OP_DIV = range(7)
+binary_opcodes = {'+': OP_ADD, '-': OP_SUB, '*': OP_MUL, '/': OP_DIV}
 
-class CodeGenerator:
-    def generate(self, node):
+class Bytecode:
+    def __init__(self):
+        self.code = array('q')
+        self.constants = []
+        self.names = []
+        self.constant_slots = {}
+        self.name_slots = {}
+
+    def constant(self, value):
+        #! Keyed by type too: 1 and 1.0 hash equal but must keep their own slots.
+        key = (type(value), value)
+        slot = self.constant_slots.get(key)
+        if slot is None:
+            slot = self.constant_slots[key] = len(self.constants)
+            self.constants.append(value)
+        return slot
+
+    def slot(self, name):
+        slot = self.name_slots.get(name)
+        if slot is None:
+            slot = self.name_slots[name] = len(self.names)
+            self.names.append(name)
+        return slot
+
+    def environment(self, slots):
+        return {name: value for name, value in zip(self.names, slots) if value is not None}
+
+class BytecodeCompiler:
+    def compile(self, statements, bytecode=None):
+        if bytecode is None:
+            bytecode = Bytecode()
+        if not isinstance(statements, list):
+            statements = [statements]
+        for statement in statements:
+            if not isinstance(statement, AssignNode):
+                raise RuntimeError(f"Unsupported statement type: {type(statement)}")
+            self.compile_expression(statement.value, bytecode)
+            bytecode.code.append(OP_STORE | bytecode.slot(statement.variable) << 8)
+        return bytecode
+
+    def compile_expression(self, node, bytecode):
+        #! Post-order walk with an explicit stack so deep trees cannot hit the
+        #! recursion limit; a visited BinOpNode emits its operator.
+        emit = bytecode.code.append
+        pending = [(node, False)]
+        while pending:
+            node, visited = pending.pop()
+            if isinstance(node, BinOpNode):
+                if visited:
+                    opcode = binary_opcodes.get(node.operator)
+                    if opcode is None:
+                        raise RuntimeError(f"Unsupported operator: {node.operator}")
+                    emit(opcode)
+                else:
+                    pending.append((node, True))
+                    pending.append((node.right, False))
+                    pending.append((node.left, False))
+            elif isinstance(node, NumberNode):
+                emit(OP_CONST | bytecode.constant(number_value(node.value)) << 8)
+            elif isinstance(node, VariableNode):
+                emit(OP_LOAD | bytecode.slot(node.name) << 8)
+            else:
+                raise RuntimeError(f"Unsupported node type: {type(node)}")
+
+class VirtualMachine:
+    def __init__(self):
+        self.environment = {}
+
+    def run(self, bytecode):
+        slots = [self.environment.get(name) for name in bytecode.names]
+        slots = self.execute(bytecode, slots)
+        self.environment.update(bytecode.environment(slots))
+        return slots
+
+    def execute(self, bytecode, slots=None):
+        if slots is None:
+            slots = [None] * len(bytecode.names)
+        constants = bytecode.constants
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for instruction in bytecode.code:
+            opcode = instruction & 0xFF
+            if opcode == OP_CONST:
+                push(constants[instruction >> 8])
+            elif opcode == OP_LOAD:
+                value = slots[instruction >> 8]
+                if value is None:
+                    raise RuntimeError(f"Undefined variable: {bytecode.names[instruction >> 8]}")
+                push(value)
+            elif opcode == OP_ADD:
+                right = pop()
+                stack[-1] += right
+            elif opcode == OP_MUL:
+                right = pop()
+                stack[-1] *= right
+            elif opcode == OP_SUB:
+                right = pop()
+                stack[-1] -= right
+            elif opcode == OP_DIV:
+                right = pop()
+                if right == 0:
+                    raise ZeroDivisionError("Division by zero")
+                stack[-1] /= right
+            elif opcode == OP_STORE:
+                slots[instruction >> 8] = pop()
+        return slots
+
+
+#! Step 3c: Closure Compilation
+
+class ClosureCompiler:
+    #! Turns each node into a nested closure once; operator dispatch and
+    #! literal parsing happen here, so calling the result is only arithmetic.
+    def __init__(self):
+        self.memo = {}
+
+    def compile(self, node):
+        compiled = self.memo.get(node)
+        if compiled is None:
+            compiled = self.memo[node] = self.compile_node(node)
+        return compiled
+
+    def compile_node(self, node):
         if isinstance(node, NumberNode):
-            return self.generate_number(node)
+            return self.compile_number(node)
         elif isinstance(node, BinOpNode):
-            return self.generate_binOp(node)
+            return self.compile_binOp(node)
+        elif isinstance(node, VariableNode):
+            return self.compile_variable(node)
         elif isinstance(node, AssignNode):
-            return self.generate_assign(node)
+            return self.compile_assign(node)
+        else:
+            raise RuntimeError(f"Unsupported node type: {type(node)}")
+
+    def compile_number(self, node):
+        value = number_value(node.value)
+        return lambda env: value
+
+    def compile_variable(self, node):
+        name = node.name
+        def load(env):
+            try:
+                return env[name]
+            except KeyError:
+                raise RuntimeError(f"Undefined variable: {name}") from None
+        return load
+
+    def compile_binOp(self, node):
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        if node.operator == '+':
+            return lambda env: left(env) + right(env)
+        elif node.operator == '-':
+            return lambda env: left(env) - right(env)
+        elif node.operator == '*':
+            return lambda env: left(env) * right(env)
+        elif node.operator == '/':
+            def divide(env):
+                leftValue = left(env)
+                rightValue = right(env)
+                if rightValue == 0:
+                    raise ZeroDivisionError("Division by zero")
+                return leftValue / rightValue
+            return divide
+        else:
+            raise RuntimeError(f"Unsupported operator: {node.operator}")
+
+    def compile_assign(self, node):
+        variable = node.variable
+        value = self.compile(node.value)
+        def assign(env):
+            result = env[variable] = value(env)
+            return result
+        return assign
+
+    def compile_program(self, statements):
+        compiled = [self.compile(statement) for statement in statements]
+        def run(env):
+            for statement in compiled:
+                statement(env)
+            return env
+        return run
+
+
+#! Step 3d: Incremental Recompute
+
+def variables_read(node):
+    names = []
+    seen = set()
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        if isinstance(node, VariableNode):
+            names.append(node.name)
+        elif isinstance(node, BinOpNode) and not node.constant:
+            pending.append(node.right)
+            pending.append(node.left)
+    return names
+
+class IncrementalEvaluator:
+    #! Spreadsheet-style evaluation of a straight-line program. Each variable
+    #! read is bound to the latest earlier assignment of that name, or to an
+    #! input when nothing assigns it first; those bindings are the edges of
+    #! the dependency graph. Statement order is already a topological order,
+    #! so update() re-evaluates affected statements from a min-heap of
+    #! indices, and a statement whose value did not change stops propagation.
+    def __init__(self, statements, inputs=None):
+        self.statements = statements
+        self.inputs = dict(inputs or {})
+        self.compiler = ClosureCompiler()
+        self.compiled = []
+        self.bindings = []
+        self.dependents = [[] for _ in statements]
+        self.input_readers = {}
+        self.values = [None] * len(statements)
+        self.last_definition = {}
+        self.stats = {'evaluated': 0, 'unchanged': 0}
+        for index, statement in enumerate(statements):
+            if not isinstance(statement, AssignNode):
+                raise RuntimeError(f"Unsupported statement type: {type(statement)}")
+            bindings = []
+            for name in variables_read(statement.value):
+                definition = self.last_definition.get(name)
+                if definition is None:
+                    self.input_readers.setdefault(name, []).append(index)
+                else:
+                    self.dependents[definition].append(index)
+                bindings.append((name, definition))
+            self.bindings.append(bindings)
+            self.compiled.append(self.compiler.compile(statement.value))
+            self.last_definition[statement.variable] = index
+        self.environment = {}
+        self.evaluate()
+
+    def evaluate_statement(self, index):
+        env = {}
+        for name, definition in self.bindings[index]:
+            if definition is not None:
+                env[name] = self.values[definition]
+            elif name in self.inputs:
+                env[name] = self.inputs[name]
+        try:
+            return self.compiled[index](env)
+        except ZeroDivisionError:
+            raise ZeroDivisionError(f"Division by zero in assignment to {self.statements[index].variable}") from None
+
+    def evaluate(self):
+        for index in range(len(self.statements)):
+            self.values[index] = self.evaluate_statement(index)
+        self.stats['evaluated'] = len(self.statements)
+        self.stats['unchanged'] = 0
+        self.environment = dict(self.inputs)
+        for name, index in self.last_definition.items():
+            self.environment[name] = self.values[index]
+        return self.environment
+
+    def update(self, changes):
+        #! Returns the variables whose final value changed.
+        changed = {}
+        pending = []
+        queued = set()
+        for name, value in changes.items():
+            if name not in self.input_readers and name in self.last_definition:
+                raise RuntimeError(f"{name} is assigned by the program, not an input")
+            if name in self.inputs and self.inputs[name] == value:
+                continue
+            self.inputs[name] = value
+            if name not in self.last_definition:
+                changed[name] = self.environment[name] = value
+            for index in self.input_readers.get(name, ()):
+                if index not in queued:
+                    queued.add(index)
+                    heapq.heappush(pending, index)
+        evaluated = unchanged = 0
+        while pending:
+            index = heapq.heappop(pending)
+            value = self.evaluate_statement(index)
+            evaluated += 1
+            if value == self.values[index]:
+                unchanged += 1
+                continue
+            self.values[index] = value
+            variable = self.statements[index].variable
+            if self.last_definition[variable] == index:
+                changed[variable] = self.environment[variable] = value
+            for dependent in self.dependents[index]:
+                if dependent not in queued:
+                    queued.add(dependent)
+                    heapq.heappush(pending, dependent)
+        self.stats['evaluated'] = evaluated
+        self.stats['unchanged'] = unchanged
+        return changed
+
+
+#! Step 3e: Vectorized Batch Evaluation
+
+def load_numpy():
+    #! NumPy is optional and slow to import, so it is only loaded on first use.
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Batch evaluation requires NumPy (pip install numpy)") from None
+    return numpy
+
+class VectorEvaluator:
+    #! Evaluates a program over columns of input rows. Each statement compiles
+    #! to whole-array ufunc calls writing into scratch buffers that are freed
+    #! as soon as their parent consumes them, so a handful of buffers serve
+    #! the whole program. Rows are processed in blocks to keep those buffers
+    #! in cache. Arithmetic is float64 throughout. Division by zero raises,
+    #! or yields nan, IEEE 754 results ('inf': +/-inf, but nan for 0/0, which
+    #! has no sign) or zero.
+    division_policies = ('raise', 'nan', 'inf', 'zero')
+
+    def __init__(self, statements, division='raise', block_size=1 << 14):
+        if division not in self.division_policies:
+            raise RuntimeError(f"Unknown division policy: {division}")
+        self.np = load_numpy()
+        self.division = division
+        self.block_size = block_size
+        self.ufuncs = {'+': self.np.add, '-': self.np.subtract, '*': self.np.multiply, '/': self.np.divide}
+        self.instructions = []
+        self.buffer_count = 0
+        self.free_buffers = []
+        self.targets = []
+        if not isinstance(statements, list):
+            statements = [statements]
+        for statement in statements:
+            if not isinstance(statement, AssignNode):
+                raise RuntimeError(f"Unsupported statement type: {type(statement)}")
+            self.compile_statement(statement)
+
+    def compile_statement(self, statement):
+        target = ('column', statement.variable)
+        value = self.operand(statement.value, statement.variable)
+        if value is None:
+            self.compile_expression(statement.value, target, statement.variable)
         else:
-            raise RuntimeError(f"Unknown node type: {type(node)}")
+            self.instructions.append(('copy', value, None, target, statement.variable))
+        if statement.variable not in self.targets:
+            self.targets.append(statement.variable)
+
+    def operand(self, node, variable):
+        #! Leaves and foldable constant subtrees become operands; None means
+        #! the node needs array operations.
+        if isinstance(node, VariableNode):
+            return ('variable', node.name)
+        if isinstance(node, NumberNode) or (node.constant and isinstance(node, BinOpNode)):
+            try:
+                return ('constant', float(Evaluator().evaluate(node)))
+            except ZeroDivisionError:
+                if isinstance(node, NumberNode):
+                    raise
+            except OverflowError:
+                raise RuntimeError(f"Constant out of float64 range in assignment to {variable}") from None
+        return None
+
+    def compile_expression(self, node, target, variable):
+        results = []
+        pending = [(node, False)]
+        while pending:
+            node, visited = pending.pop()
+            if visited:
+                right = results.pop()
+                left = results.pop()
+                for operand in (left, right):
+                    if operand[0] == 'buffer':
+                        self.free_buffers.append(operand[1])
+                out = target if not pending else ('buffer', self.allocate_buffer())
+                self.instructions.append((node.operator, left, right, out, variable))
+                results.append(out)
+                continue
+            value = self.operand(node, variable)
+            if value is not None:
+                results.append(value)
+            elif isinstance(node, BinOpNode):
+                pending.append((node, True))
+                pending.append((node.right, False))
+                pending.append((node.left, False))
+            else:
+                raise RuntimeError(f"Unsupported node type: {type(node)}")
+
+    def allocate_buffer(self):
+        if self.free_buffers:
+            return self.free_buffers.pop()
+        self.buffer_count += 1
+        return self.buffer_count - 1
+
+    def run(self, columns, rows=None):
+        np = self.np
+        inputs = {name: np.asarray(column, dtype=np.float64) for name, column in columns.items()}
+        for name, column in inputs.items():
+            if rows is None:
+                rows = len(column)
+            elif len(column) != rows:
+                raise RuntimeError(f"Column {name} has {len(column)} rows, expected {rows}")
+        if rows is None:
+            raise RuntimeError("Row count is unknown: pass rows= when there are no input columns")
+        outputs = {name: np.empty(rows) for name in self.targets}
+        size = min(self.block_size, rows) or 1
+        buffers = [np.empty(size) for _ in range(self.buffer_count)]
+        mask = np.empty(size, dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for start in range(0, rows, size):
+                self.run_block(start, min(start + size, rows), inputs, outputs, buffers, mask)
+        return outputs
+
+    def run_block(self, start, stop, inputs, outputs, buffers, mask):
+        width = stop - start
+        env = {name: column[start:stop] for name, column in inputs.items()}
+        views = [buffer[:width] for buffer in buffers]
+        mask = mask[:width]
+        for op, left, right, out, variable in self.instructions:
+            destination = views[out[1]] if out[0] == 'buffer' else outputs[variable][start:stop]
+            left_value = self.resolve(left, env, views)
+            if op == 'copy':
+                destination[...] = left_value
+            elif op == '/':
+                self.divide(left_value, self.resolve(right, env, views), destination, mask, variable)
+            else:
+                self.ufuncs[op](left_value, self.resolve(right, env, views), out=destination)
+            if out[0] == 'column':
+                env[variable] = destination
+
+    def resolve(self, operand, env, views):
+        kind, value = operand
+        if kind == 'constant':
+            return value
+        elif kind == 'buffer':
+            return views[value]
+        try:
+            return env[value]
+        except KeyError:
+            raise RuntimeError(f"Undefined variable: {value}") from None
+
+    def divide(self, left, right, out, mask, variable):
+        np = self.np
+        np.equal(right, 0, out=mask)
+        if self.division == 'raise' and mask.any():
+            raise ZeroDivisionError(f"Division by zero in assignment to {variable}")
+        np.divide(left, right, out=out)
+        if self.division == 'nan':
+            np.copyto(out, np.nan, where=mask)
+        elif self.division == 'zero':
+            np.copyto(out, 0.0, where=mask)
+
+
+#! Step 4: Code Generation to Python Code
+
+
+class CompileCache:
+    #! LRU map from a hash of program source to its compiled code object.
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source):
+        import hashlib
+        return hashlib.blake2b(source.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, key):
+        code = self.entries.get(key)
+        if code is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return code
+
+    def put(self, key, code):
+        self.entries[key] = code
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+class CodeGenerator:
+    #! Source text is written into one buffer from an explicit stack. A child
+    #! is parenthesized when it binds looser than its operator requires: the
+    #! left operand needs the operator's precedence, the right one strictly
+    #! more, which keeps a - (b - c) and a + (b + c) grouped as parsed.
+    python_operators = {'+': 'Add', '-': 'Sub', '*': 'Mult', '/': 'Div'}
+
+    def __init__(self, cache=None):
+        #! memo, seen and ast_memo only live for one generate/compile call, so
+        #! a long-lived generator holds no trees beyond what `cache` keeps.
+        self.memo = {}
+        self.seen = set()
+        self.ast_memo = {}
+        self.cache = cache if cache is not None else CompileCache()
+
+    def generate(self, node):
+        buffer = []
+        try:
+            if instrumentation is None:
+                self.write(node, buffer)
+            else:
+                with instrumentation.phase('generate'):
+                    self.write(node, buffer)
+        finally:
+            self.memo.clear()
+            self.seen.clear()
+        return ''.join(buffer)
+
+    def generate_program(self, statements):
+        buffer = []
+        try:
+            if instrumentation is None:
+                self.write_program(statements, buffer)
+            else:
+                with instrumentation.phase('generate'):
+                    self.write_program(statements, buffer)
+        finally:
+            self.memo.clear()
+            self.seen.clear()
+        return ''.join(buffer)
+
+    def write_program(self, statements, buffer):
+        for statement in statements:
+            self.write(statement, buffer)
+            buffer.append('\n')
 
     def generate_number(self, node):
         return str(node.value)
 
-    def generate_binOp(self, node):
-        left = self.generate(node.left)
-        right = self.generate(node.right)
-        return f"{left} {node.operator} {right}"
+    def generate_variable(self, node):
+        return node.name
 
-    def generate_assign(self, node):
-        variable = node.variable
-        value = self.generate(node.value)
-        return f"{variable} = {value}"
+    def write(self, node, buffer):
+        if isinstance(node, AssignNode):
+            buffer.append(node.variable)
+            buffer.append(' = ')
+            node = node.value
+        self.write_expression(node, buffer)
 
-    
+    def write_expression(self, node, buffer, required=0):
+        append = buffer.append
+        pending = [(node, required)]
+        while pending:
+            node, required = pending.pop()
+            if isinstance(node, str):
+                append(node)
+            elif isinstance(node, int):
+                #! Closing marker: the operator node `required` was written
+                #! from buffer position `node` on.
+                self.memo[required] = ''.join(buffer[node:])
+            elif isinstance(node, NumberNode):
+                append(self.generate_number(node))
+            elif isinstance(node, VariableNode):
+                append(self.generate_variable(node))
+            elif isinstance(node, BinOpNode):
+                precedence = operator_precedence.get(node.operator)
+                if precedence is None:
+                    raise RuntimeError(f"Unsupported operator: {node.operator}")
+                grouped = precedence < required
+                #! An interned subtree met a second time is written out once
+                #! more and its text is kept; later occurrences reuse it.
+                text = self.memo.get(node)
+                if text is not None:
+                    append(f'({text})' if grouped else text)
+                    continue
+                if grouped:
+                    append('(')
+                    pending.append((')', 0))
+                if node in self.seen:
+                    pending.append((len(buffer), node))
+                else:
+                    self.seen.add(node)
+                pending.append((node.right, precedence + 1))
+                pending.append((f' {node.operator} ', 0))
+                pending.append((node.left, precedence))
+            else:
+                raise RuntimeError(f"Unknown node type: {type(node)}")
+
+    def python_tree(self, statements):
+        #! Builds the Python ast directly, so no source text is produced or
+        #! reparsed. `ast` is imported here to keep it off the import path.
+        import ast as python_ast
+        if not isinstance(statements, list):
+            statements = [statements]
+        operators = {symbol: getattr(python_ast, name)() for symbol, name in self.python_operators.items()}
+        load, store = python_ast.Load(), python_ast.Store()
+        body = []
+        try:
+            for line, statement in enumerate(statements, 1):
+                if not isinstance(statement, AssignNode):
+                    raise RuntimeError(f"Unsupported statement type: {type(statement)}")
+                target = python_ast.Name(statement.variable, store, lineno=line, col_offset=0)
+                value = self.python_expression(statement.value, python_ast, operators, load, line)
+                body.append(python_ast.Assign([target], value, lineno=line, col_offset=0))
+        finally:
+            self.ast_memo.clear()
+        return python_ast.Module(body, [])
+
+    def python_expression(self, node, python_ast, operators, load, line):
+        #! Locations are set as nodes are built (end positions are optional);
+        #! ast.fix_missing_locations would walk the tree again, recursively.
+        Constant, Name, BinOp = python_ast.Constant, python_ast.Name, python_ast.BinOp
+        memo = self.ast_memo
+        results = []
+        pending = [(node, False)]
+        while pending:
+            node, visited = pending.pop()
+            converted = memo.get(node)
+            if converted is not None:
+                results.append(converted)
+                continue
+            if isinstance(node, NumberNode):
+                converted = Constant(number_value(node.value), lineno=line, col_offset=0)
+            elif isinstance(node, VariableNode):
+                converted = Name(node.name, load, lineno=line, col_offset=0)
+            elif isinstance(node, BinOpNode):
+                if not visited:
+                    pending.append((node, True))
+                    pending.append((node.right, False))
+                    pending.append((node.left, False))
+                    continue
+                operator = operators.get(node.operator)
+                if operator is None:
+                    raise RuntimeError(f"Unsupported operator: {node.operator}")
+                right = results.pop()
+                left = results.pop()
+                converted = BinOp(left, operator, right, lineno=line, col_offset=0)
+            else:
+                raise RuntimeError(f"Unknown node type: {type(node)}")
+            memo[node] = converted
+            results.append(converted)
+        return results[0]
+
+    def compile(self, statements, filename='<generated>'):
+        if instrumentation is not None:
+            with instrumentation.phase('compile'):
+                return compile(self.python_tree(statements), filename, 'exec')
+        return compile(self.python_tree(statements), filename, 'exec')
 
+    def compile_text(self, statements, filename='<generated>'):
+        #! CPython's own parser turns text into its ast faster than Python code
+        #! can build one, so this is the quicker route; nesting too deep for
+        #! that parser falls back to the ast built here.
+        try:
+            text = self.generate_program(statements)
+            if instrumentation is not None:
+                with instrumentation.phase('compile'):
+                    return compile(text, filename, 'exec')
+            return compile(text, filename, 'exec')
+        except (SyntaxError, RecursionError, MemoryError):
+            return self.compile(statements, filename)
 
-code = "x = 10 + 20;"
-tokens = list(tokenize(code))
-parser = Parser(tokens)
-ast = parser.parse()  # This returns a single AssignNode
+    def compile_source(self, source):
+        #! Repeated programs skip tokenizing, parsing and compiling altogether.
+        key = self.cache.key(source)
+        code = self.cache.get(key)
+        if instrumentation is not None:
+            instrumentation.cache('compile_source', code is not None)
+        if code is None:
+            code = self.compile_text(parse_program(source))
+            self.cache.put(key, code)
+        return code
 
-generator = CodeGenerator()
-generated_code = generator.generate(ast)  # Directly pass the ast (AssignNode) here
-print("Generated Code:")
-print(generated_code)
 
+if __name__ == "__main__":
+    code = "x = 10 + 20;"
+    tokens = list(tokenize(code))
+    parser = Parser(tokens)
+    ast = parser.parse()  # This returns a single AssignNode
+    ast = Optimizer().optimize(ast)  # Folds 10 + 20 before the back ends see it
 
+    generator = CodeGenerator()
+    generated_code = generator.generate(ast)  # Directly pass the ast (AssignNode) here
+    print("Generated Code:")
+    print(generated_code)
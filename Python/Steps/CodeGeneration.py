@@ -1,3 +1,6 @@
+from Parsing import AssignNode, BinOpNode, NumberNode
+
+
 class CodeGenerator:
     def generate(self, node):
         if isinstance(node, NumberNode):
@@ -25,12 +28,16 @@ class CodeGenerator:
     
 
 
-# code = "x = 10 + 20;"
-# tokens = list(tokenize(code))
-# parser = Parser(tokens)
-# ast = parser.parse()  # This returns a single AssignNode
+if __name__ == "__main__":
+    from LexicalAnalysis import tokenize
+    from Parsing import Parser
+
+    code = "x = 10 + 20;"
+    tokens = list(tokenize(code))
+    parser = Parser(tokens)
+    ast = parser.parse()  # This returns a single AssignNode
 
-# generator = CodeGenerator()
-# generated_code = generator.generate(ast)  # Directly pass the ast (AssignNode) here
-# print("Generated Code:")
-# print(generated_code)
\ No newline at end of file
+    generator = CodeGenerator()
+    generated_code = generator.generate(ast)  # Directly pass the ast (AssignNode) here
+    print("Generated Code:")
+    print(generated_code)
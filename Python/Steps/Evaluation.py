@@ -1,3 +1,6 @@
+from Parsing import AssignNode, BinOpNode, NumberNode
+
+
 class Evaluator:
     def __init__(self):
         self.environment = {}
@@ -36,12 +39,70 @@ class Evaluator:
     
 
 
-# code = "x = 10 + 20;"
-# tokens = list(tokenize(code))
-# parser = Parser(tokens)
-# ast = parser.parse()
+class ClosureCompiler:
+    #! Turns each node into a nested closure once; operator dispatch and
+    #! literal parsing happen here, so calling the result is only arithmetic.
+    def compile(self, node):
+        if isinstance(node, NumberNode):
+            return self.compile_number(node)
+        elif isinstance(node, BinOpNode):
+            return self.compile_binOp(node)
+        elif isinstance(node, AssignNode):
+            return self.compile_assign(node)
+        else:
+            raise RuntimeError(f"Unsupported node type: {type(node)}")
+
+    def compile_number(self, node):
+        value = float(node.value) if '.' in node.value else int(node.value)
+        return lambda env: value
+
+    def compile_binOp(self, node):
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        if node.operator == '+':
+            return lambda env: left(env) + right(env)
+        elif node.operator == '-':
+            return lambda env: left(env) - right(env)
+        elif node.operator == '*':
+            return lambda env: left(env) * right(env)
+        elif node.operator == '/':
+            def divide(env):
+                leftValue = left(env)
+                rightValue = right(env)
+                if rightValue == 0:
+                    raise ZeroDivisionError("Division by zero")
+                return leftValue / rightValue
+            return divide
+        else:
+            raise RuntimeError(f"Unsupported operator: {node.operator}")
+
+    def compile_assign(self, node):
+        variable = node.variable
+        value = self.compile(node.value)
+        def assign(env):
+            result = env[variable] = value(env)
+            return result
+        return assign
+
+    def compile_program(self, statements):
+        compiled = [self.compile(statement) for statement in statements]
+        def run(env):
+            for statement in compiled:
+                statement(env)
+            return env
+        return run
+
+
+if __name__ == "__main__":
+    from LexicalAnalysis import tokenize
+    from Parsing import Parser
+
+    code = "x = 10 + 20;"
+    tokens = list(tokenize(code))
+    parser = Parser(tokens)
+    ast = parser.parse()
 
-# evaluator = Evaluator()
-# result = evaluator.evaluate(ast)
-# print(f"Result: {result}")
-# print(f"Environment: {evaluator.environment}")
\ No newline at end of file
+    evaluator = Evaluator()
+    result = evaluator.evaluate(ast)
+    print(f"Result: {result}")
+    print(f"Environment: {evaluator.environment}")
@@ -1,4 +1,5 @@
 import re
+from collections import namedtuple
 
 # Lexical Analysis (Tokenization)
 token_specification = [
@@ -7,24 +8,82 @@ token_specification = [
     ('END',r';'), #! End of statement
     ('ID',r'[A-Za-z]+'), #! Identifier
     ('OP',r'[+\-*/]'), #! Operators
-    ('WHITESPACE',r'[ \t]+'), #! Whitespace
+    ('NEWLINE',r'\n'), #! Line break
+    ('WHITESPACE',r'[ \t\r]+'), #! Whitespace
     ('MISMATCH',r'.'), #! Any other character
 ]
 
 token_regex = "|".join(f"(?P<{name}>{pattern})" for name, pattern in token_specification)
+token_pattern = re.compile(token_regex)
+
+Token = namedtuple('Token', ['kind', 'value', 'line', 'column'])
 
 def tokenize(code):
-    for match in re.finditer(token_regex, code):
+    line, line_start = 1, 0
+    for match in token_pattern.finditer(code):
         kind = match.lastgroup
-        value = match.group(kind)
         if kind == 'WHITESPACE':
             continue
-        elif kind == 'MISMATCH':
-            raise RuntimeError(f"f'Unexpected character {value}")
-        yield kind, value
+        elif kind == 'NEWLINE':
+            line += 1
+            line_start = match.end()
+            continue
+        value = match.group()
+        column = match.start() - line_start + 1
+        if kind == 'MISMATCH':
+            raise RuntimeError(f"Unexpected character {value!r} at line {line}, column {column}")
+        yield Token(kind, value, line, column)
+
+
+def read_chunks(source, chunk_size):
+    if hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def tokenize_stream(source, chunk_size=1 << 16):
+    #! source is a text file object or any iterable of string chunks. A match
+    #! that touches the end of the buffer may continue in the next chunk, so it
+    #! is carried over instead of emitted; only that tail is kept in memory.
+    chunks = read_chunks(source, chunk_size)
+    buffer = ''
+    offset = 0
+    line, line_start = 1, 0
+    at_end = False
+    while not at_end:
+        chunk = next(chunks, None)
+        if chunk is None:
+            at_end = True
+        else:
+            buffer += chunk
+        consumed = 0
+        for match in token_pattern.finditer(buffer):
+            if not at_end and match.end() == len(buffer):
+                break
+            consumed = match.end()
+            kind = match.lastgroup
+            if kind == 'WHITESPACE':
+                continue
+            elif kind == 'NEWLINE':
+                line += 1
+                line_start = offset + consumed
+                continue
+            value = match.group()
+            column = offset + match.start() - line_start + 1
+            if kind == 'MISMATCH':
+                raise RuntimeError(f"Unexpected character {value!r} at line {line}, column {column}")
+            yield Token(kind, value, line, column)
+        buffer = buffer[consumed:]
+        offset += consumed
 
 
-# code = " x =    20 + 10;"
-# tokens = list(tokenize(code))
-# print(tokens)
-# print(len(tokens))
\ No newline at end of file
+if __name__ == "__main__":
+    code = " x =    20 + 10;"
+    tokens = list(tokenize(code))
+    print(tokens)
+    print(len(tokens))
@@ -47,7 +47,8 @@ class Parser:
             raise RuntimeError("Unexpected token")
         
     def consume(self, expected_type):
-        token_type, token_value = self.tokens[self.pos]
+        token = self.tokens[self.pos]
+        token_type, token_value = token[0], token[1]
         if token_type == expected_type:
             self.pos += 1
             return token_value
@@ -59,8 +60,11 @@ class Parser:
         return False
     
 
-# code = "x = 10 + 20;"
-# tokens = list(tokenize(code))
-# parser = Parser(tokens)
-# ast = parser.parse()
-# print(ast)
\ No newline at end of file
+if __name__ == "__main__":
+    from LexicalAnalysis import tokenize
+
+    code = "x = 10 + 20;"
+    tokens = list(tokenize(code))
+    parser = Parser(tokens)
+    ast = parser.parse()
+    print(ast)
@@ -1,34 +1,208 @@
 import ast
+import bisect
+import heapq
+import itertools
+import operator
+import sys
+import threading
+from collections import namedtuple
+
+# CPython converts parse trees to ast objects recursively in C. Source too
+# deep for the default stack is reparsed on a thread whose stack grows with
+# the input, up to this many bytes.
+MAX_PARSE_STACK = 1 << 30
+
+# The deep retry is opt-in: it raises the process-wide recursion limit and
+# thread stack size while it runs, so another thread on a normal stack could
+# crash instead of raising RecursionError. The lock only keeps concurrent
+# retries from interleaving those changes. Without it, deep source raises
+# RecursionError; generate() also accepts a prebuilt tree of any depth.
+deepParseLock = threading.Lock()
+
+
+def parseSource(code, allowDeepRetry=False):
+    try:
+        return ast.parse(code)
+    except RecursionError:
+        if not allowDeepRetry:
+            raise
+    stackSize = min(max(len(code) * 256, 1 << 24), MAX_PARSE_STACK)
+    outcome = []
+
+    def work():
+        try:
+            outcome.append(ast.parse(code))
+        except BaseException as error:
+            outcome.append(error)
+
+    with deepParseLock:
+        limit = sys.getrecursionlimit()
+        previousStack = threading.stack_size(stackSize)
+        sys.setrecursionlimit(max(limit, stackSize // 256))
+        try:
+            worker = threading.Thread(target=work)
+            worker.start()
+            worker.join()
+        finally:
+            sys.setrecursionlimit(limit)
+            threading.stack_size(previousStack)
+    if isinstance(outcome[0], BaseException):
+        raise outcome[0]
+    return outcome[0]
+
+
+Quadruple = namedtuple('Quadruple', ['op', 'arg1', 'arg2', 'result'])
+
+
+class Temp(namedtuple('Temp', ['number'])):
+    # Temporaries are their own operand type rather than names, so a program
+    # variable called t1 is never mistaken for one.
+    __slots__ = ()
+
+    def __str__(self):
+        return f't{self.number}'
+
 
 class ThreeAddressCode(ast.NodeVisitor):
-    def __init__(self):
+    unaryOperators = {ast.USub: 'minus', ast.Not: 'not', ast.Invert: '~'}
+    compareOperators = {
+        ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=',
+        ast.Eq: '==', ast.NotEq: '!=',
+    }
+
+    def __init__(self, allowDeepRetry=False):
         self.tempCount = 0
         self.code = []
+        self.allowDeepRetry = allowDeepRetry
 
     def newTemp(self):
         self.tempCount += 1
-        return f't{self.tempCount}'
+        return Temp(self.tempCount)
 
-    def visit_BinOp(self, node):
-        left = self.visit(node.left)
-        right = self.visit(node.right)
+    def emit(self, op, arg1, arg2, result):
+        if op == '=':
+            self.code.append(f"{result} = {arg1}")
+        elif arg2 is None:
+            self.code.append(f"{result} = {op} {arg1}")
+        else:
+            self.code.append(f"{result} = {arg1} {op} {arg2}")
+
+    def expression(self, node):
+        # Post-order walk on an explicit stack, so the depth of an expression
+        # chain is bounded by memory rather than the recursion limit.
+        operands = []
+        stack = [(node, False)]
+        while stack:
+            node, ready = stack.pop()
+            if ready:
+                operands.append(self.combine(node, operands))
+            elif isinstance(node, ast.Constant):
+                operands.append(self.constant(node.value))
+            elif isinstance(node, ast.Name):
+                operands.append(node.id)
+            elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) \
+                    and isinstance(node.operand, ast.Constant):
+                operands.append(self.constant(-node.operand.value))
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(self.children(node)))
+        return operands.pop()
+
+    def children(self, node):
+        if isinstance(node, ast.BinOp):
+            return [node.left, node.right]
+        elif isinstance(node, ast.UnaryOp):
+            return [node.operand]
+        elif isinstance(node, ast.Compare):
+            return [node.left, *node.comparators]
+        else:
+            raise ValueError(f"Unsupported expression: {type(node).__name__}")
+
+    def combine(self, node, operands):
+        if isinstance(node, ast.BinOp):
+            right = operands.pop()
+            left = operands.pop()
+            return self.emitTemp(self.getOperator(node.op), left, right)
+        elif isinstance(node, ast.UnaryOp):
+            operand = operands.pop()
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            return self.emitTemp(self.getUnaryOperator(node.op), operand, None)
+        # a < b < c lowers to (a < b) and (b < c); every operand is evaluated once.
+        values = operands[-len(node.comparators) - 1:]
+        del operands[-len(node.comparators) - 1:]
+        result = None
+        for op, left, right in zip(node.ops, values, values[1:]):
+            test = self.emitTemp(self.getCompareOperator(op), left, right)
+            result = test if result is None else self.emitTemp('and', result, test)
+        return result
+
+    def emitTemp(self, op, arg1, arg2):
         temp = self.newTemp()
-        operator = self.getOperator(node.op)
-        self.code.append(f"{temp} = {left} {operator} {right}")
+        self.emit(op, arg1, arg2, temp)
         return temp
 
-    def visit_Num(self, node):
-        return str(node.n)
+    def constant(self, value):
+        # Literals stay ints and floats in the code, so later passes tell
+        # them from variable names (even one called inf) by type.
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Unsupported constant: {value!r}")
+        return value
+
+    def visit_BinOp(self, node):
+        return self.expression(node)
+
+    visit_UnaryOp = visit_Compare = visit_Constant = visit_Name = visit_BinOp
 
     def visit_Assign(self, node):
-        value = self.visit(node.value)
         for target in node.targets:
-            self.code.append(f"{target.id} = {value}")
+            if not isinstance(target, (ast.Name, ast.Tuple)):
+                raise ValueError(f"Unsupported assignment target: {type(target).__name__}")
+        if any(isinstance(target, ast.Tuple) for target in node.targets):
+            self.assignTuple(node)
+            return
+        value = self.expression(node.value)
+        for target in node.targets:
+            self.emit('=', value, None, target.id)
+
+    def assignTuple(self, node):
+        # a, b = b, a: every value is computed before any target is written.
+        if not isinstance(node.value, ast.Tuple):
+            raise ValueError("Tuple assignment needs a tuple of values")
+        values = []
+        for element in node.value.elts:
+            value = self.expression(element)
+            if isinstance(element, ast.Name):
+                value = self.emitTemp('=', value, None)
+            values.append(value)
+        for target in node.targets:
+            names = getattr(target, 'elts', None)
+            if not isinstance(target, ast.Tuple):
+                raise ValueError("Cannot mix tuple and single targets")
+            if len(names) != len(values):
+                raise ValueError("Tuple assignment needs as many values as targets")
+            for name, value in zip(names, values):
+                if not isinstance(name, ast.Name):
+                    raise ValueError(f"Unsupported assignment target: {type(name).__name__}")
+                self.emit('=', value, None, name.id)
+
+    def visit_AugAssign(self, node):
+        if not isinstance(node.target, ast.Name):
+            raise ValueError(f"Unsupported assignment target: {type(node.target).__name__}")
+        value = self.expression(node.value)
+        result = self.emitTemp(self.getOperator(node.op), node.target.id, value)
+        self.emit('=', result, None, node.target.id)
+
+    def visit_Expr(self, node):
+        self.expression(node.value)
 
     def visit_Module(self, node):
         for stmt in node.body:
             self.visit(stmt)
 
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
     def getOperator(self, operator):
         if isinstance(operator, ast.Add):
             return '+'
@@ -41,20 +215,323 @@ class ThreeAddressCode(ast.NodeVisitor):
         else:
             raise ValueError(f"Unsupported operation: {operator}")
 
+    def getUnaryOperator(self, operator):
+        try:
+            return self.unaryOperators[type(operator)]
+        except KeyError:
+            raise ValueError(f"Unsupported operation: {operator}") from None
+
+    def getCompareOperator(self, operator):
+        try:
+            return self.compareOperators[type(operator)]
+        except KeyError:
+            raise ValueError(f"Unsupported operation: {operator}") from None
+
     def generate(self, code):
-        tree = ast.parse(code)
+        # Accepts source text or an already built tree, which lets generated
+        # programs skip the parser's own nesting limits.
+        tree = code if isinstance(code, ast.AST) else parseSource(code, self.allowDeepRetry)
         self.visit(tree)
         return self.code
 
 
+class QuadrupleCode(ThreeAddressCode):
+    commutative = {'+', '*', '==', '!=', 'and'}
+
+    def __init__(self, allowDeepRetry=False):
+        super().__init__(allowDeepRetry)
+        self.temps = set()
+        self.stats = {}
+
+    def newTemp(self):
+        temp = super().newTemp()
+        self.temps.add(temp)
+        return temp
+
+    def emit(self, op, arg1, arg2, result):
+        self.code.append(Quadruple(op, arg1, arg2, result))
+
+    def generate(self, code, optimize=True):
+        quads = super().generate(code)
+        self.stats = {
+            'instructions_before': len(quads),
+            'temps_before': len(self.temps),
+        }
+        if optimize:
+            quads = self.reuseTemps(self.valueNumbering(quads))
+            self.temps = {quad.result for quad in quads if isinstance(quad.result, Temp)}
+        self.stats['instructions_after'] = len(quads)
+        self.stats['temps_after'] = len(self.temps)
+        self.code = quads
+        return quads
+
+    def valueNumbering(self, quads):
+        # Local value numbering over the straight-line block. A repeated
+        # (op, vn, vn) is dropped and its temp aliased to the earlier holder;
+        # reassigning a variable gives it a new number, so stale entries miss.
+        numbers = {}
+        available = {}
+        aliases = {}
+        optimized = []
+        counter = itertools.count()
+
+        def valueNumber(operand):
+            if isinstance(operand, (int, float)):
+                operand = constantKey(operand)
+            number = numbers.get(operand)
+            if number is None:
+                number = numbers[operand] = next(counter)
+            return number
+
+        for op, arg1, arg2, result in quads:
+            arg1 = aliases.get(arg1, arg1)
+            arg2 = aliases.get(arg2, arg2)
+            if op == '=':
+                optimized.append(Quadruple(op, arg1, None, result))
+                numbers[result] = valueNumber(arg1)
+                continue
+            key = (op, valueNumber(arg1), valueNumber(arg2))
+            if op in self.commutative and key[1] > key[2]:
+                key = (op, key[2], key[1])
+            holder = available.get(key)
+            if holder is not None:
+                aliases[result] = holder
+                continue
+            optimized.append(Quadruple(op, arg1, arg2, result))
+            numbers[result] = next(counter)
+            available[key] = result
+        return optimized
+
+    def reuseTemps(self, quads):
+        # Liveness-based renaming: a temp's name returns to the pool after its
+        # last use, and each new result takes the lowest free name.
+        lastUse = {}
+        for index, quad in enumerate(quads):
+            for operand in (quad.arg1, quad.arg2):
+                if isinstance(operand, Temp):
+                    lastUse[operand] = index
+        free = []
+        slots = {}
+        slotCount = 0
+        renamed = []
+        for index, (op, arg1, arg2, result) in enumerate(quads):
+            operands = {operand for operand in (arg1, arg2) if isinstance(operand, Temp)}
+            arg1 = Temp(slots[arg1]) if arg1 in operands else arg1
+            arg2 = Temp(slots[arg2]) if arg2 in operands else arg2
+            for operand in operands:
+                if lastUse[operand] == index:
+                    heapq.heappush(free, slots[operand])
+            if isinstance(result, Temp):
+                if free:
+                    slot = heapq.heappop(free)
+                else:
+                    slotCount += 1
+                    slot = slotCount
+                slots[result] = slot
+                result = Temp(slot)
+            renamed.append(Quadruple(op, arg1, arg2, result))
+        return renamed
+
+
+def constantKey(value):
+    # 1, 1.0 and 0.0, -0.0 compare equal but give different results.
+    return type(value), repr(value)
+
+
+def formatQuadruple(quad):
+    if quad.op == '=':
+        return f"{quad.result} = {quad.arg1}"
+    if quad.arg2 is None:
+        return f"{quad.result} = {quad.op} {quad.arg1}"
+    return f"{quad.result} = {quad.arg1} {quad.op} {quad.arg2}"
+
+
+class RegisterMachine:
+    # Executes quadruples over one flat storage list laid out as
+    # [registers | variables | spill slots | constants]; every operand is
+    # resolved to a storage index when the program is assembled.
+    COPY, ADD, SUB, MUL, DIV, MINUS, NOT, INVERT, LT, LE, GT, GE, EQ, NE, AND = range(15)
+    opcodes = {
+        '=': COPY, '+': ADD, '-': SUB, '*': MUL, '/': DIV,
+        'minus': MINUS, 'not': NOT, '~': INVERT,
+        '<': LT, '<=': LE, '>': GT, '>=': GE, '==': EQ, '!=': NE, 'and': AND,
+    }
+    # Opcodes without an inline branch in run() dispatch through these.
+    unaryFunctions = {MINUS: operator.neg, NOT: operator.not_, INVERT: operator.invert}
+    binaryFunctions = {
+        LT: operator.lt, LE: operator.le, GT: operator.gt, GE: operator.ge,
+        EQ: operator.eq, NE: operator.ne, AND: lambda left, right: left and right,
+    }
+
+    def __init__(self, registerCount=8):
+        self.registerCount = registerCount
+        self.program = []
+        self.initial = []
+        self.variableSlots = {}
+        self.inputVariables = ()
+        self.stats = {}
+
+    def liveIntervals(self, quads):
+        # Every definition of a temp starts a new interval, so names recycled
+        # by QuadrupleCode.reuseTemps still get independent live ranges.
+        intervals = []
+        current = {}
+        versions = []
+        for index, quad in enumerate(quads):
+            uses = []
+            for operand in (quad.arg1, quad.arg2):
+                if isinstance(operand, Temp):
+                    interval = current[operand]
+                    intervals[interval][1] = index
+                    uses.append(interval)
+                else:
+                    uses.append(None)
+            definition = None
+            if isinstance(quad.result, Temp):
+                definition = current[quad.result] = len(intervals)
+                intervals.append([index, index])
+            versions.append((uses[0], uses[1], definition))
+        return intervals, versions
+
+    def allocate(self, intervals):
+        # Linear scan (Poletto & Sarkar): intervals arrive ordered by start;
+        # when no register is free, the active interval ending last is spilled.
+        locations = [None] * len(intervals)
+        active = []
+        free = list(range(self.registerCount))
+        spillSlots = 0
+        for interval, (start, end) in enumerate(intervals):
+            while active and active[0][0] <= start:
+                _, expired = active.pop(0)
+                heapq.heappush(free, locations[expired][1])
+            if free:
+                locations[interval] = ('register', heapq.heappop(free))
+                bisect.insort(active, (end, interval))
+                continue
+            lastEnd, victim = active[-1]
+            if lastEnd > end:
+                locations[interval] = locations[victim]
+                locations[victim] = ('spill', spillSlots)
+                active.pop()
+                bisect.insort(active, (end, interval))
+            else:
+                locations[interval] = ('spill', spillSlots)
+            spillSlots += 1
+        return locations, spillSlots
+
+    def assemble(self, quads):
+        # Operands are classified by type: Temp, str (a variable) or an int or
+        # float literal.
+        intervals, versions = self.liveIntervals(quads)
+        locations, spillSlots = self.allocate(intervals)
+        # The code is straight-line, so the variables read before their first
+        # assignment are exactly the ones run() needs as inputs.
+        variables = {}
+        inputVariables = []
+        for quad in quads:
+            for operand in (quad.arg1, quad.arg2):
+                if isinstance(operand, str) and operand not in variables:
+                    variables[operand] = len(variables)
+                    inputVariables.append(operand)
+            if isinstance(quad.result, str):
+                variables.setdefault(quad.result, len(variables))
+        variableBase = self.registerCount
+        spillBase = variableBase + len(variables)
+        constantBase = spillBase + spillSlots
+        constants = {}
+        self.initial = [None] * constantBase
+
+        def slotOf(interval):
+            kind, index = locations[interval]
+            return index if kind == 'register' else spillBase + index
+
+        def operandSlot(operand, interval):
+            if interval is not None:
+                return slotOf(interval)
+            if isinstance(operand, str):
+                return variableBase + variables[operand]
+            key = constantKey(operand)
+            slot = constants.get(key)
+            if slot is None:
+                slot = constants[key] = constantBase + len(constants)
+                self.initial.append(operand)
+            return slot
+
+        spillLoads = spillStores = 0
+        self.program = []
+        for quad, (use1, use2, definition) in zip(quads, versions):
+            arg1 = operandSlot(quad.arg1, use1)
+            arg2 = operandSlot(quad.arg2, use2) if quad.arg2 is not None else 0
+            result = operandSlot(quad.result, definition)
+            spillLoads += sum(1 for use in (use1, use2) if use is not None and locations[use][0] == 'spill')
+            if definition is not None and locations[definition][0] == 'spill':
+                spillStores += 1
+            self.program.append((self.opcodes[quad.op], arg1, arg2, result))
+        self.variableSlots = {name: variableBase + index for name, index in variables.items()}
+        self.inputVariables = tuple(inputVariables)
+        self.stats = {
+            'registers': self.registerCount,
+            'intervals': len(intervals),
+            'spilled': spillSlots,
+            'spill_loads': spillLoads,
+            'spill_stores': spillStores,
+        }
+        return self.program
+
+    def run(self, inputs=None):
+        # Inputs the program never mentions are ignored.
+        inputs = inputs or {}
+        for name in self.inputVariables:
+            if name not in inputs:
+                raise NameError(f"Undefined variable: {name}")
+        storage = self.initial[:]
+        variableSlots = self.variableSlots
+        for name, value in inputs.items():
+            slot = variableSlots.get(name)
+            if slot is not None:
+                storage[slot] = value
+        COPY, ADD, SUB, MUL, DIV = self.COPY, self.ADD, self.SUB, self.MUL, self.DIV
+        unary, binary = self.unaryFunctions, self.binaryFunctions
+        for opcode, arg1, arg2, result in self.program:
+            if opcode == ADD:
+                storage[result] = storage[arg1] + storage[arg2]
+            elif opcode == MUL:
+                storage[result] = storage[arg1] * storage[arg2]
+            elif opcode == SUB:
+                storage[result] = storage[arg1] - storage[arg2]
+            elif opcode == COPY:
+                storage[result] = storage[arg1]
+            elif opcode == DIV:
+                divisor = storage[arg2]
+                if divisor == 0:
+                    raise ZeroDivisionError("Division by zero")
+                storage[result] = storage[arg1] / divisor
+            elif opcode in unary:
+                storage[result] = unary[opcode](storage[arg1])
+            else:
+                storage[result] = binary[opcode](storage[arg1], storage[arg2])
+        return {name: storage[slot] for name, slot in self.variableSlots.items()}
+
+
 # Example usage
-code = """
+if __name__ == "__main__":
+    code = """
 x = 5 + 3 * 2
 y = x - 1
 """
 
-generator = ThreeAddressCode()
-tac = generator.generate(code)
+    generator = ThreeAddressCode()
+    tac = generator.generate(code)
+
+    for line in tac:
+        print(line)
+
+    optimizer = QuadrupleCode()
+    for quad in optimizer.generate(code):
+        print(formatQuadruple(quad))
+    print(optimizer.stats)
 
-for line in tac:
-    print(line)
\ No newline at end of file
+    machine = RegisterMachine(registerCount=2)
+    machine.assemble(optimizer.code)
+    print(machine.run())
+    print(machine.stats)
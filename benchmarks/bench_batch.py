@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+
+from common import ROOT, randomProgram
+
+sys.path.insert(0, os.path.join(ROOT, "Python"))
+import Batch  # noqa: E402  (workers unpickle tasks by module name, so it must be importable)
+
+
+def main():
+    files = 4_000
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(files):
+            with open(os.path.join(directory, f"program{index}.calc"), "w") as source:
+                source.write(randomProgram(10, depth=4, seed=index, operators="+-*"))
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+        cores = os.cpu_count() or 1
+        counts = sorted({1, 2, 4, cores})
+        print(f"{files} files, {cores} cores")
+        print(f"{'workers':>7} {'chunk':>6} {'seconds':>8} {'files/s':>8} {'speedup':>8}")
+        baseline = None
+        for workers in counts:
+            for chunkSize in (1, 64):
+                with open(os.devnull, "w") as output:
+                    stats = Batch.compile_batch(paths, output, workers, chunkSize)
+                assert stats["files"] == files and not stats["errors"]
+                if baseline is None:
+                    baseline = stats["files_per_second"]
+                print(f"{workers:>7} {chunkSize:>6} {stats['seconds']:>8.2f} "
+                      f"{stats['files_per_second']:>8.0f} {stats['files_per_second'] / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import time
+
+from common import loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+
+def main(runs=20):
+    program = pipeline.parse_program(randomProgram(5_000, depth=5, operators="+-*"))
+
+    def treeWalk():
+        for _ in range(runs):
+            evaluator = pipeline.Evaluator()
+            for statement in program:
+                evaluator.evaluate(statement)
+
+    compiled = pipeline.ClosureCompiler().compile_program(program)
+    bytecode = pipeline.BytecodeCompiler().compile(program)
+    machine = pipeline.VirtualMachine()
+
+    for name, function in (
+        ("Evaluator", treeWalk),
+        ("closures", lambda: [compiled({}) for _ in range(runs)]),
+        ("bytecode VM", lambda: [machine.execute(bytecode) for _ in range(runs)]),
+    ):
+        started = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - started
+        print(f"{name:>12}: {runs * len(program) / seconds:12,.0f} statements/s")
+
+
+if __name__ == "__main__":
+    main()
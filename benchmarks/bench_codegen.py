@@ -0,0 +1,48 @@
+import time
+
+from common import best, loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+
+def main():
+    inputs = {"ia": 3, "ib": -2, "ic": 5}
+    source = randomProgram(20_000, depth=5, names=tuple(inputs), operators="+-*")
+    program = pipeline.parse_program(source)
+
+    def treeWalk():
+        evaluator = pipeline.Evaluator()
+        evaluator.environment.update(inputs)
+        for statement in program:
+            evaluator.evaluate(statement)
+
+    generator = pipeline.CodeGenerator()
+    textSeconds = best(lambda: pipeline.CodeGenerator().generate_program(program), repeat=3)
+    text = generator.generate_program(program)
+    sourceCompileSeconds = best(lambda: compile(text, "<generated>", "exec"), repeat=3)
+    astCompileSeconds = best(lambda: pipeline.CodeGenerator().compile(program), repeat=3)
+    textCompileSeconds = best(lambda: pipeline.CodeGenerator().compile_text(program), repeat=3)
+
+    started = time.perf_counter()
+    code = generator.compile_source(source)
+    coldSeconds = time.perf_counter() - started
+    started = time.perf_counter()
+    assert generator.compile_source(source) is code
+    warmSeconds = time.perf_counter() - started
+
+    walkSeconds = best(treeWalk)
+    execSeconds = best(lambda: exec(code, dict(inputs)))
+    print(f"{len(program)} statements")
+    print(f"generate source text:              {textSeconds:.4f}s")
+    print(f"compile(source text):              {sourceCompileSeconds:.4f}s")
+    print(f"compile(ast built directly):       {astCompileSeconds:.4f}s")
+    print(f"compile_text (generate + compile): {textCompileSeconds:.4f}s")
+    print(f"compile_source cold / cached:      {coldSeconds:.4f}s / {warmSeconds * 1e6:.1f}us "
+          f"(hits {generator.cache.hits}, misses {generator.cache.misses})")
+    print(f"Evaluator:                         {walkSeconds:.4f}s per run")
+    print(f"exec(code object):                 {execSeconds:.4f}s per run ({walkSeconds / execSeconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
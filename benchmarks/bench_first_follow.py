@@ -0,0 +1,24 @@
+import time
+
+from common import expressionRules, loadModule
+
+
+lr1 = loadModule("lr1", "LR(1)/Complier.py")
+
+
+def main():
+    print(f"{'levels':>6} {'prods':>6} {'seconds':>9}")
+    for levels in (10, 20, 40, 80, 160, 320, 640):
+        grammar = lr1.Grammar(expressionRules(levels, operatorsPerLevel=3))
+        grammar.setStartSymbol("S")
+        productions = sum(len(prods) for prods in grammar.rules.values())
+        started = time.perf_counter()
+        firstFollow = lr1.FirstFollow(grammar)
+        firstFollow.computeFirst()
+        firstFollow.computeFollow()
+        seconds = time.perf_counter() - started
+        print(f"{levels:>6} {productions:>6} {seconds:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
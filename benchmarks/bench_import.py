@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+from common import ROOT
+
+
+# Milliseconds allowed for a cold `import` in a fresh interpreter (bytecode
+# already cached). The bare package must stay nearly free; submodules pay for
+# their own stdlib dependencies but no longer run any demo code.
+BUDGET_MS = {
+    "compiler": 3,
+    "compiler.lexer": 20,
+    "compiler.pipeline": 20,
+    "compiler.lr0": 25,
+    "compiler.lr1": 25,
+    "compiler.tac": 20,
+}
+
+PROBE = "import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+
+
+def importSeconds(module, repeat=5):
+    # The first run writes __pycache__ even where the environment disables it.
+    environment = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    timings = []
+    for _ in range(repeat + 1):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            cwd=ROOT, env=environment, capture_output=True, text=True, check=True,
+        ).stdout
+        timings.append(float(output))
+    return min(timings[1:])
+
+
+def main():
+    failures = 0
+    print(f"{'module':>18} {'ms':>7} {'budget':>7}")
+    for module, budget in BUDGET_MS.items():
+        milliseconds = importSeconds(module) * 1000
+        status = "" if milliseconds <= budget else "  OVER BUDGET"
+        failures += bool(status)
+        print(f"{module:>18} {milliseconds:>7.2f} {budget:>7}{status}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+from common import best, expressionRules, loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+lr0 = loadModule("lr0", "LR(0)/Compiler.py")
+instrumentation = loadModule("instrumentation", "compiler/instrumentation.py")
+
+
+def main():
+    source = randomProgram(5_000, depth=5, operators="+-*")
+    grammar = lr0.Grammar(expressionRules(40, operatorsPerLevel=3))
+
+    def workload():
+        factory = pipeline.NodeFactory()
+        program = pipeline.Optimizer(factory).optimize(pipeline.parse_program(source, factory))
+        evaluator = pipeline.Evaluator()
+        for statement in program:
+            evaluator.evaluate(statement)
+        pipeline.CodeGenerator().generate_program(program)
+        grammar.engine = None
+        lr0.constructCanonicalCollection(grammar)
+
+    disabledSeconds = best(workload)
+    recorder = instrumentation.Instrumentation().attach(pipeline, lr0)
+    enabledSeconds = best(workload)
+    recorder.detach()
+    memoryRecorder = instrumentation.Instrumentation(trace_memory=True).attach(pipeline, lr0)
+    memorySeconds = best(workload, repeat=1)
+    memoryRecorder.detach()
+
+    print(f"disabled:           {disabledSeconds:.4f}s")
+    print(f"enabled:            {enabledSeconds:.4f}s ({enabledSeconds / disabledSeconds - 1:+.1%})")
+    print(f"enabled + memory:   {memorySeconds:.4f}s ({memorySeconds / disabledSeconds - 1:+.1%})")
+    print()
+    print(f"{'phase':>20} {'calls':>7} {'seconds':>9} {'peak KiB':>9}")
+    for name, stats in memoryRecorder.snapshot()["phases"].items():
+        print(f"{name:>20} {stats['calls']:>7} {stats['seconds']:>9.4f} {stats['peak_bytes'] / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import time
+import tracemalloc
+
+from common import loadModule, repetitiveProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+
+class PlainFactory:
+    # Builds a fresh node for every occurrence, like the parser used to.
+    number = staticmethod(pipeline.NumberNode)
+    binop = staticmethod(pipeline.BinOpNode)
+    assign = staticmethod(pipeline.AssignNode)
+
+
+def main():
+    text = repetitiveProgram(20_000)
+    for name, factory in (("plain", PlainFactory()), ("interned", pipeline.NodeFactory())):
+        tracemalloc.start()
+        program = pipeline.parse_program(text, factory)
+        astBytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        evaluator = pipeline.Evaluator()
+        for statement in program:
+            evaluator.evaluate(statement)
+        evaluateSeconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        generator = pipeline.CodeGenerator()
+        for statement in program:
+            generator.generate(statement)
+        generateSeconds = time.perf_counter() - started
+        print(f"{name:>9}: AST {astBytes / 1e6:6.2f} MB, evaluate {evaluateSeconds:.3f}s, "
+              f"generate {generateSeconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+from common import loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+
+def drain(tokens):
+    deque(tokens, maxlen=0)
+
+
+def measure(function):
+    started = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    text = randomProgram(200_000, depth=4)
+    megabytes = len(text) / 1e6
+    with tempfile.NamedTemporaryFile("w", suffix=".src", delete=False) as file:
+        file.write(text)
+    try:
+        def wholeString():
+            with open(file.name) as source:
+                drain(pipeline.tokenize(source.read()))
+
+        def streamed():
+            with open(file.name) as source:
+                drain(pipeline.tokenize_stream(source))
+
+        print(f"{megabytes:.1f} MB source")
+        for name, function in (("whole string", wholeString), ("streamed", streamed)):
+            seconds, peak = measure(function)
+            print(f"{name:>12}: {megabytes / seconds:6.2f} MB/s, peak {peak / 1e6:6.2f} MB")
+    finally:
+        os.unlink(file.name)
+
+
+if __name__ == "__main__":
+    main()
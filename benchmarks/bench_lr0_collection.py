@@ -0,0 +1,17 @@
+from common import expressionRules, loadModule, timeCall
+
+
+lr0 = loadModule("lr0", "LR(0)/Compiler.py")
+
+
+def main():
+    print(f"{'levels':>6} {'prods':>6} {'states':>7} {'seconds':>9}")
+    for levels in (5, 10, 20, 40, 80, 160):
+        grammar = lr0.Grammar(expressionRules(levels, operatorsPerLevel=3))
+        productions = sum(len(prods) for prods in grammar.rules.values())
+        seconds, (states, _) = timeCall(lr0.constructCanonicalCollection, grammar)
+        print(f"{levels:>6} {productions:>6} {len(states):>7} {seconds:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
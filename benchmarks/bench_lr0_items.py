@@ -0,0 +1,53 @@
+import tracemalloc
+from collections import deque
+
+from common import expressionRules, loadModule, timeCall
+
+
+lr0 = loadModule("lr0", "LR(0)/Compiler.py")
+
+
+def objectCollection(grammar):
+    # Reference builder over Item objects using the module-level closure/goto.
+    startState = lr0.closure({lr0.Item("S'", ["S"])}, grammar)
+    states = [startState]
+    stateMapping = {frozenset(startState): 0}
+    worklist = deque([0])
+    while worklist:
+        state = states[worklist.popleft()]
+        symbols = {item.rhs[item.dotPosition] for item in state if not item.isCompleted()}
+        for symbol in symbols:
+            nextState = lr0.goto(state, symbol, grammar)
+            key = frozenset(nextState)
+            if key not in stateMapping:
+                stateMapping[key] = len(states)
+                states.append(nextState)
+                worklist.append(len(states) - 1)
+    return states
+
+
+def packedCollection(grammar):
+    return lr0.ItemEngine(grammar).canonicalCollection()[0]
+
+
+def peakMemory(function, grammar):
+    tracemalloc.start()
+    timeCall(function, grammar, repeat=1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    print(f"{'levels':>6} {'objects s':>10} {'packed s':>9} {'objects KiB':>12} {'packed KiB':>11}")
+    for levels in (5, 10, 20, 40):
+        grammar = lr0.Grammar(expressionRules(levels, operatorsPerLevel=3))
+        objectSeconds, _ = timeCall(objectCollection, grammar)
+        packedSeconds, _ = timeCall(packedCollection, grammar)
+        objectPeak = peakMemory(objectCollection, grammar) // 1024
+        packedPeak = peakMemory(packedCollection, grammar) // 1024
+        print(f"{levels:>6} {objectSeconds:>10.4f} {packedSeconds:>9.4f} {objectPeak:>12} {packedPeak:>11}")
+
+
+if __name__ == "__main__":
+    main()
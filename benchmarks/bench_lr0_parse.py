@@ -0,0 +1,60 @@
+import random
+import time
+
+from common import loadModule
+
+
+lr0 = loadModule("lr0", "LR(0)/Compiler.py")
+
+# An LR(0) grammar for nested bracketed lists: S -> [ L ], L -> L , X | X.
+LIST_RULES = {
+    "S": [["[", "L", "]"]],
+    "L": [["L", ",", "X"], ["X"]],
+    "X": [["a"], ["[", "L", "]"]],
+}
+
+
+def randomList(size, seed=0):
+    rng = random.Random(seed)
+    tokens = ["["]
+    depth = 0
+    for i in range(size):
+        if i:
+            tokens.append(",")
+        if depth < 8 and rng.random() < 0.1:
+            tokens.append("[")
+            depth += 1
+        tokens.append("a")
+        if depth and rng.random() < 0.1:
+            tokens.append("]")
+            depth -= 1
+    tokens.extend("]" * (depth + 1))
+    return tokens
+
+
+def main():
+    grammar = lr0.Grammar(LIST_RULES)
+    states, transitions = lr0.constructCanonicalCollection(grammar)
+    action, gotoTable = lr0.constructParsingTable(states, transitions, grammar)
+    table = lr0.compileParsingTable(grammar)
+    assert not table.conflicts, table.conflictReport()
+
+    print(f"{'tokens':>9} {'dict tok/s':>12} {'dense tok/s':>12}")
+    for size in (10_000, 100_000, 1_000_000):
+        tokens = randomList(size)
+        text = " ".join(tokens)
+
+        started = time.perf_counter()
+        assert lr0.parse(text, action, gotoTable, grammar)
+        dictRate = len(tokens) / (time.perf_counter() - started)
+
+        tokenIds = table.encodeTokens(tokens)
+        started = time.perf_counter()
+        assert table.parseTokens(tokenIds)
+        denseRate = len(tokens) / (time.perf_counter() - started)
+
+        print(f"{len(tokens):>9} {dictRate:>12,.0f} {denseRate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
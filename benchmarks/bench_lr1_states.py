@@ -0,0 +1,21 @@
+import time
+
+from common import cExpressionRules, loadModule
+
+
+lr1 = loadModule("lr1", "LR(1)/Complier.py")
+
+
+def main():
+    grammar = lr1.Grammar(cExpressionRules())
+    grammar.setStartSymbol("S")
+    table = lr1.ParsingTable(grammar)
+    started = time.perf_counter()
+    table.constructTable()
+    seconds = time.perf_counter() - started
+    print(f"canonical LR(1) C expression grammar: {len(table.states)} states, "
+          f"{len(table.itemIds)} items in {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import time
+
+from common import expressionRules, loadModule
+
+
+lr0 = loadModule("lr0", "LR(0)/Compiler.py")
+lr1 = loadModule("lr1", "LR(1)/Complier.py")
+
+
+def grammarRules(levels):
+    return expressionRules(levels, operatorsPerLevel=2)
+
+
+def lr0Row(levels):
+    started = time.perf_counter()
+    table = lr0.compileParsingTable(lr0.Grammar(grammarRules(levels)))
+    seconds = time.perf_counter() - started
+    entries = sum(1 for cell in table.action if cell) + sum(1 for cell in table.gotoTable if cell >= 0)
+    return table.stateCount, seconds, entries
+
+
+def lr1Row(tableClass, levels):
+    grammar = lr1.Grammar(grammarRules(levels))
+    grammar.setStartSymbol("S")
+    table = tableClass(grammar)
+    started = time.perf_counter()
+    table.constructTable()
+    seconds = time.perf_counter() - started
+    entries = sum(map(len, table.actionTable.values())) + sum(map(len, table.gotoTable.values()))
+    return len(table.states), seconds, entries
+
+
+def main():
+    print(f"{'levels':>6} {'table':>8} {'states':>7} {'seconds':>9} {'entries':>8}")
+    for levels in (4, 8, 16):
+        rows = [
+            ("LR(0)", lr0Row(levels)),
+            ("LALR(1)", lr1Row(lr1.LALRParsingTable, levels)),
+            ("LR(1)", lr1Row(lr1.ParsingTable, levels)),
+        ]
+        for name, (states, seconds, entries) in rows:
+            print(f"{levels:>6} {name:>8} {states:>7} {seconds:>9.4f} {entries:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import time
+
+from common import loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+# Identities that hold for ints but change a float result's type or sign;
+# optimizing must leave every value (compared by repr) as it was.
+edgePrograms = [
+    "x = 2; a = x * 1.0; b = 1.0 * x; c = x + 0.0; d = x - 0.0; e = x * 0.0; f = x * 1; g = x * 0;",
+    "x = 0.0 * (0 - 1); a = x + 0; b = 0 + x; c = x - 0; d = x * 1;",
+    "y = 10000000000.0; x = " + " * ".join(["y"] * 32) + "; a = x * 0; b = 0 * x; c = x + 0;",
+    "x = 3; y = x / 1; a = y * 0; b = y + 0; c = x * 0 + y * 1;",
+]
+
+
+def evaluateAll(program, runs=10):
+    started = time.perf_counter()
+    for _ in range(runs):
+        evaluator = pipeline.Evaluator()
+        for statement in program:
+            evaluator.evaluate(statement)
+    return time.perf_counter() - started
+
+
+def evaluateValues(program):
+    evaluator = pipeline.Evaluator()
+    for statement in program:
+        evaluator.evaluate(statement)
+    return sorted((name, repr(value)) for name, value in evaluator.environment.items())
+
+
+def checkEdgePrograms():
+    for source in edgePrograms:
+        program = pipeline.parse_program(source)
+        expected = evaluateValues(program)
+        actual = evaluateValues(pipeline.Optimizer().optimize(program))
+        assert actual == expected, f"{source!r}: optimized {actual} != {expected}"
+
+
+def main():
+    checkEdgePrograms()
+    program = pipeline.parse_program(randomProgram(10_000, depth=5, operators="+-*"))
+    optimizer = pipeline.Optimizer()
+    started = time.perf_counter()
+    optimized = optimizer.optimize(program)
+    optimizeSeconds = time.perf_counter() - started
+    print(f"optimizer: {optimizeSeconds:.3f}s, stats {optimizer.stats}")
+    print(f"evaluate original:  {evaluateAll(program):.3f}s")
+    print(f"evaluate optimized: {evaluateAll(optimized):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import sys
+import time
+
+from common import loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+
+def main(statements=1_000_000):
+    text = randomProgram(statements, depth=2)
+    started = time.perf_counter()
+    program = pipeline.parse_program(text)
+    seconds = time.perf_counter() - started
+    assert len(program) == statements
+    print(f"{statements} statements, {len(text) / 1e6:.1f} MB: "
+          f"{seconds:.2f}s, {statements / seconds:,.0f} statements/s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,37 @@
+import tempfile
+import time
+
+from common import expressionRules, loadModule
+
+
+lr0 = loadModule("lr0", "LR(0)/Compiler.py")
+lr1 = loadModule("lr1", "LR(1)/Complier.py")
+
+
+def timeLr0(levels, cacheDir):
+    started = time.perf_counter()
+    lr0.cachedParsingTable(lr0.Grammar(expressionRules(levels, operatorsPerLevel=3)), cacheDir)
+    return time.perf_counter() - started
+
+
+def timeLr1(levels, cacheDir):
+    grammar = lr1.Grammar(expressionRules(levels, operatorsPerLevel=2))
+    grammar.setStartSymbol("S")
+    started = time.perf_counter()
+    lr1.ParsingTable(grammar).constructCachedTable(cacheDir)
+    return time.perf_counter() - started
+
+
+def main():
+    print(f"{'table':>6} {'levels':>6} {'cold s':>9} {'warm s':>9}")
+    with tempfile.TemporaryDirectory() as cacheDir:
+        for levels in (20, 80, 160):
+            cold, warm = timeLr0(levels, cacheDir), timeLr0(levels, cacheDir)
+            print(f"{'LR(0)':>6} {levels:>6} {cold:>9.4f} {warm:>9.4f}")
+        for levels in (4, 8, 16):
+            cold, warm = timeLr1(levels, cacheDir), timeLr1(levels, cacheDir)
+            print(f"{'LR(1)':>6} {levels:>6} {cold:>9.4f} {warm:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
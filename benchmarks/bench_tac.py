@@ -0,0 +1,29 @@
+import time
+
+from common import loadModule, randomProgram, repetitiveProgram
+
+
+tac = loadModule("tac", "Three Address Code(TAC)/Compiler.py")
+
+
+def corpus():
+    yield "random", randomProgram(2_000, depth=5, names=("va", "vb", "vc"))
+    yield "repetitive", repetitiveProgram(2_000)
+    yield "chained", "".join(f"v{i} = a * b + a * b * c;\n" for i in range(2_000))
+
+
+def main():
+    print(f"{'program':>11} {'instr before':>12} {'instr after':>11} "
+          f"{'temps before':>12} {'temps after':>11} {'seconds':>8}")
+    for name, source in corpus():
+        generator = tac.QuadrupleCode()
+        started = time.perf_counter()
+        generator.generate("va = 1\nvb = 2\nvc = 3\na = 1\nb = 2\nc = 3\n" + source)
+        seconds = time.perf_counter() - started
+        stats = generator.stats
+        print(f"{name:>11} {stats['instructions_before']:>12} {stats['instructions_after']:>11} "
+              f"{stats['temps_before']:>12} {stats['temps_after']:>11} {seconds:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import ast
+import time
+
+from common import loadModule
+
+
+tac = loadModule("tac", "Three Address Code(TAC)/Compiler.py")
+
+
+def leftChain(depth):
+    return "x = " + " + ".join(["1"] * depth) + "\n"
+
+
+def rightNestedTree(depth):
+    # Deeper than CPython's parser accepts as source, so the tree is built directly.
+    value = ast.Name("y", ast.Load())
+    for level in range(depth):
+        if level % 2:
+            value = ast.UnaryOp(ast.USub(), value)
+        else:
+            value = ast.BinOp(ast.Constant(2), ast.Sub(), value)
+    assign = ast.Assign(targets=[ast.Name("x", ast.Store())], value=value)
+    return ast.Module(body=[assign], type_ignores=[])
+
+
+def main():
+    print(f"{'input':>22} {'generator':>16} {'depth':>8} {'instructions':>12} {'seconds':>8} {'nodes/s':>10}")
+    for depth in (10_000, 100_000, 300_000):
+        inputs = [("left chain (source)", leftChain(depth)), ("right nested (tree)", rightNestedTree(depth))]
+        for name, code in inputs:
+            # Deep source needs the opt-in big-stack reparse; this script is
+            # single-threaded, so raising the process-wide limits is safe.
+            for generator in (tac.ThreeAddressCode(allowDeepRetry=True), tac.QuadrupleCode(allowDeepRetry=True)):
+                started = time.perf_counter()
+                instructions = generator.generate(code)
+                seconds = time.perf_counter() - started
+                print(f"{name:>22} {type(generator).__name__:>16} {depth:>8} {len(instructions):>12} "
+                      f"{seconds:>8.3f} {depth / seconds:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import time
+
+from common import loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+tac = loadModule("tac", "Three Address Code(TAC)/Compiler.py")
+
+
+def best(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+# Small programs whose results must match Python's own before timing starts.
+edgePrograms = [
+    "t1 = 5\ny = t1 + 2 * 3\n",  # a variable named like a temporary
+    "inf = 3\nnan = 4\ninfinity = 5\ny = inf + nan + infinity + 1\n",  # names float() accepts
+    "a = 7\nb = a * 1\nc = a * 1.0\nd = a * 0.0\ne = a * -0.0\n",  # equal literals of another type or sign
+]
+
+
+def checkEdgePrograms():
+    for source in edgePrograms:
+        generator = tac.QuadrupleCode()
+        machine = tac.RegisterMachine(2)
+        machine.assemble(generator.generate(source))
+        expected = {}
+        exec(source, {}, expected)
+        # repr() keeps 1 apart from 1.0 and 0.0 apart from -0.0.
+        assert sorted((name, repr(value)) for name, value in machine.run().items()) == \
+            sorted((name, repr(value)) for name, value in expected.items()), \
+            f"register machine disagrees with Python on {source!r}"
+    # Unused inputs are ignored; a variable read before assignment is named.
+    machine = tac.RegisterMachine(2)
+    machine.assemble(tac.QuadrupleCode().generate("y = x + 1\nx = y\n"))
+    assert machine.run({"x": 1, "unused": 2}) == {"x": 2, "y": 2}
+    try:
+        machine.run()
+    except NameError as error:
+        assert str(error) == "Undefined variable: x", error
+    else:
+        raise AssertionError("reading an unset variable did not raise NameError")
+
+
+def main():
+    checkEdgePrograms()
+    source = randomProgram(20_000, depth=5, operators="+-*")
+    program = pipeline.parse_program(source)
+
+    def treeWalk():
+        evaluator = pipeline.Evaluator()
+        for statement in program:
+            evaluator.evaluate(statement)
+        return evaluator.environment
+
+    walkSeconds, expected = best(treeWalk)
+    print(f"{len(program)} statements")
+    print(f"Evaluator: {walkSeconds:.4f}s per run")
+
+    generator = tac.QuadrupleCode()
+    started = time.perf_counter()
+    quads = generator.generate(source)
+    lowerSeconds = time.perf_counter() - started
+    print(f"lowered to {len(quads)} quadruples in {lowerSeconds:.3f}s")
+
+    print(f"{'registers':>9} {'spilled':>8} {'loads':>7} {'stores':>7} {'assemble':>9} {'run':>8} {'speedup':>8}")
+    for registerCount in (2, 4, 8, 16, 32):
+        machine = tac.RegisterMachine(registerCount)
+        started = time.perf_counter()
+        machine.assemble(quads)
+        assembleSeconds = time.perf_counter() - started
+        runSeconds, result = best(machine.run)
+        assert result == expected, "register machine disagrees with the Evaluator"
+        stats = machine.stats
+        print(f"{registerCount:>9} {stats['spilled']:>8} {stats['spill_loads']:>7} {stats['spill_stores']:>7} "
+              f"{assembleSeconds:>9.3f} {runSeconds:>8.4f} {walkSeconds / runSeconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import time
+import tracemalloc
+
+from common import loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+
+def traced(function):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, seconds, size
+
+
+def parseAll(tokens):
+    parser = pipeline.Parser(tokens)
+    statements = []
+    while parser.pos < len(parser.kinds):
+        statements.append(parser.assignment())
+    return statements
+
+
+def timed(function):
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def main():
+    text = randomProgram(50_000, depth=4)
+    tokens, _, tupleBytes = traced(lambda: list(pipeline.tokenize(text)))
+    buffer, _, bufferBytes = traced(lambda: pipeline.TokenBuffer(text))
+    count = len(buffer)
+    print(f"{count} tokens")
+    print(f"token tuples: {tupleBytes / count:6.1f} bytes/token")
+    print(f"token buffer: {bufferBytes / count:6.1f} bytes/token")
+
+    paths = (
+        ("token tuples", lambda: parseAll(list(pipeline.tokenize(text)))),
+        ("token buffer", lambda: parseAll(pipeline.TokenBuffer(text))),
+    )
+    for name, function in paths:
+        best = min(timed(function) for _ in range(3))
+        print(f"lex + parse {name}: {50_000 / best:10,.0f} statements/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import random
+import time
+
+from common import loadModule, randomExpression, variableName
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+INPUTS = ("price", "qty", "rate", "fee")
+
+
+def formulaSet(formulas=20, seed=0):
+    rng = random.Random(seed)
+    names = list(INPUTS)
+    lines = []
+    for index in range(formulas):
+        lines.append(f"{variableName(index)} = {randomExpression(rng, 4, names, '+-*/')};\n")
+        names.append(variableName(index))
+    return "".join(lines)
+
+
+def main():
+    try:
+        import numpy
+    except ImportError:
+        print("NumPy is not installed; skipping the vectorized benchmark")
+        return
+    program = pipeline.parse_program(formulaSet())
+    rng = numpy.random.default_rng(0)
+    rows = 1_000_000
+    columns = {name: rng.integers(0, 100, rows).astype(float) for name in INPUTS}
+
+    scalarRows = 20_000
+    started = time.perf_counter()
+    for row in range(scalarRows):
+        evaluator = pipeline.Evaluator()
+        evaluator.environment.update({name: columns[name][row].item() for name in INPUTS})
+        try:
+            for statement in program:
+                evaluator.evaluate(statement)
+        except ZeroDivisionError:
+            pass
+    scalarRate = scalarRows / (time.perf_counter() - started)
+    print(f"{len(program)} formulas, scalar Evaluator: {scalarRate:>12,.0f} rows/s")
+
+    for blockSize in (1 << 10, 1 << 14, 1 << 20):
+        vector = pipeline.VectorEvaluator(program, division="nan", block_size=blockSize)
+        started = time.perf_counter()
+        vector.run(columns)
+        rate = rows / (time.perf_counter() - started)
+        print(f"VectorEvaluator block {blockSize:>8}: {rate:>12,.0f} rows/s "
+              f"({rate / scalarRate:.0f}x, {vector.buffer_count} scratch buffers)")
+
+
+if __name__ == "__main__":
+    main()
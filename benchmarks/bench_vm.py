@@ -0,0 +1,40 @@
+import time
+
+from common import best, loadModule, randomProgram
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+
+
+def main():
+    program = pipeline.parse_program(randomProgram(20_000, depth=5, operators="+-*"))
+
+    def treeWalk():
+        evaluator = pipeline.Evaluator()
+        for statement in program:
+            evaluator.evaluate(statement)
+
+    started = time.perf_counter()
+    bytecode = pipeline.BytecodeCompiler().compile(program)
+    compileSeconds = time.perf_counter() - started
+    machine = pipeline.VirtualMachine()
+
+    walkSeconds = best(treeWalk)
+    vmSeconds = best(lambda: machine.execute(bytecode))
+    print(f"{len(program)} statements, {len(bytecode.code)} instructions "
+          f"(compiled once in {compileSeconds:.3f}s)")
+    print(f"Evaluator:      {walkSeconds:.4f}s per run")
+    print(f"VirtualMachine: {vmSeconds:.4f}s per run ({walkSeconds / vmSeconds:.1f}x)")
+
+    deep = pipeline.parse_program("x = " + " + ".join(["1"] * 100_000) + ";")
+    try:
+        pipeline.Evaluator().evaluate(deep[0])
+        walkResult = "ok"
+    except RecursionError:
+        walkResult = "RecursionError"
+    slots = pipeline.VirtualMachine().execute(pipeline.BytecodeCompiler().compile(deep))
+    print(f"100k-term chain: Evaluator {walkResult}, VirtualMachine x = {slots[0]}")
+
+
+if __name__ == "__main__":
+    main()
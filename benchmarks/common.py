@@ -0,0 +1,169 @@
+import contextlib
+import importlib.util
+import io
+import os
+import random
+import time
+import tracemalloc
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loadModule(name, relativePath):
+    # Each benchmark gets its own copy of the module under `name`, independent
+    # of the `compiler` package's shared instances.
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relativePath))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def expressionRules(levels, operatorsPerLevel=1, start="S", rightRecursive=False):
+    rules = {start: [["E0"]]}
+    for level in range(levels):
+        current, nextLevel = f"E{level}", f"E{level + 1}"
+        if rightRecursive:
+            rules[current] = [
+                [nextLevel, f"op{level}_{i}", current] for i in range(operatorsPerLevel)
+            ]
+        else:
+            rules[current] = [
+                [current, f"op{level}_{i}", nextLevel] for i in range(operatorsPerLevel)
+            ]
+        rules[current].append([nextLevel])
+    rules[f"E{levels}"] = [["(", "E0", ")"], ["id"]]
+    return rules
+
+
+def timeCall(function, *args, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def best(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def peakMemory(function):
+    # Peak bytes traced during one call; run separately from timing, since
+    # tracemalloc slows every allocation down.
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def cExpressionRules(start="S"):
+    # C's binary operator precedence ladder plus unary, postfix and primary
+    # expressions; left-recursive like a hand-written yacc grammar.
+    levels = [
+        ["||"], ["&&"], ["|"], ["^"], ["&"], ["==", "!="],
+        ["<", ">", "<=", ">="], ["<<", ">>"], ["+", "-"], ["*", "/", "%"],
+    ]
+    rules = {
+        start: [["Assign"]],
+        "Assign": [["Unary", "=", "Assign"], ["Unary", "+=", "Assign"], ["Conditional"]],
+        "Conditional": [["L0", "?", "Assign", ":", "Conditional"], ["L0"]],
+    }
+    for level, operators in enumerate(levels):
+        current, nextLevel = f"L{level}", f"L{level + 1}" if level + 1 < len(levels) else "Unary"
+        rules[current] = [[current, operator, nextLevel] for operator in operators]
+        rules[current].append([nextLevel])
+    rules["Unary"] = [["-", "Unary"], ["!", "Unary"], ["~", "Unary"], ["Postfix"]]
+    rules["Postfix"] = [
+        ["Postfix", "[", "Assign", "]"],
+        ["Postfix", "(", "Args", ")"],
+        ["Postfix", "(", ")"],
+        ["Primary"],
+    ]
+    rules["Args"] = [["Args", ",", "Assign"], ["Assign"]]
+    rules["Primary"] = [["id"], ["num"], ["(", "Assign", ")"]]
+    return rules
+
+
+def randomExpression(rng, depth, names=(), operators="+-*/"):
+    if depth <= 0 or rng.random() < 0.3:
+        if names and rng.random() < 0.3:
+            return rng.choice(names)
+        return str(rng.randint(1, 99))
+    left = randomExpression(rng, depth - 1, names, operators)
+    right = randomExpression(rng, depth - 1, names, operators)
+    operator = rng.choice(operators)
+    if rng.random() < 0.2:
+        return f"({left} {operator} {right})"
+    return f"{left} {operator} {right}"
+
+
+def sizedExpression(rng, operands, depth, names=(), operators="+-*/"):
+    # Exactly `operands` leaves; splits nest at most `depth` levels of
+    # parentheses and the rest is a flat chain left to operator precedence.
+    if operands == 1:
+        if names and rng.random() < 0.3:
+            return rng.choice(names)
+        return str(rng.randint(1, 99))
+    if depth <= 0:
+        leaves = [sizedExpression(rng, 1, 0, names, operators) for _ in range(operands)]
+        expression = leaves[0]
+        for leaf in leaves[1:]:
+            expression += f" {rng.choice(operators)} {leaf}"
+        return expression
+    leftOperands = rng.randint(1, operands - 1)
+    left = sizedExpression(rng, leftOperands, depth - 1, names, operators)
+    right = sizedExpression(rng, operands - leftOperands, depth - 1, names, operators)
+    if leftOperands > 1:
+        left = f"({left})"
+    if operands - leftOperands > 1:
+        right = f"({right})"
+    return f"{left} {rng.choice(operators)} {right}"
+
+
+def variableName(index):
+    # Identifiers in Python/Main.py are letters only.
+    name = ""
+    index += 1
+    while index:
+        index, letter = divmod(index - 1, 26)
+        name = "abcdefghijklmnopqrstuvwxyz"[letter] + name
+    return "v" + name
+
+
+def randomProgram(statements, depth=4, seed=0, names=(), operators="+-*/", operands=None):
+    # With `operands`, every statement has exactly that many leaves instead
+    # of a random tree of up to `depth` levels.
+    rng = random.Random(seed)
+    if operands is not None:
+        return "".join(
+            f"{variableName(i)} = {sizedExpression(rng, operands, depth, names, operators)};\n"
+            for i in range(statements)
+        )
+    return "".join(
+        f"{variableName(i)} = {randomExpression(rng, depth, names, operators)};\n"
+        for i in range(statements)
+    )
+
+
+def repetitiveProgram(statements, poolSize=50, depth=4, seed=0, operators="+-*"):
+    # Statements combine a few parenthesized subexpressions drawn from a small
+    # pool, the shape of generated inputs that repeat the same terms.
+    rng = random.Random(seed)
+    pool = [f"({randomExpression(rng, depth, (), operators)})" for _ in range(poolSize)]
+    lines = []
+    for i in range(statements):
+        terms = [rng.choice(pool) for _ in range(rng.randint(2, 4))]
+        lines.append(f"{variableName(i)} = {f' {rng.choice(operators)} '.join(terms)};\n")
+    return "".join(lines)
@@ -0,0 +1,279 @@
+"""Times every compiler phase on generated workloads and checks the results
+against a stored baseline.
+
+    python harness.py                   compare against baseline.json
+    python harness.py --save            record a new baseline
+    python harness.py -k pipeline -k lr1 --scale 0.2
+
+Each case reports throughput (units per second, best of --repeat runs) and
+the peak traced memory of one extra run. A case regresses when its
+throughput drops, or its peak memory grows, by more than --tolerance
+relative to the baseline; the exit status is 1 if any case regressed.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+
+from common import (ROOT, best, cExpressionRules, expressionRules, loadModule, peakMemory,
+                    randomProgram)
+
+
+pipeline = loadModule("pipeline", "Python/Main.py")
+lr0 = loadModule("lr0", "LR(0)/Compiler.py")
+lr1 = loadModule("lr1", "LR(1)/Complier.py")
+tac = loadModule("tac", "Three Address Code(TAC)/Compiler.py")
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+INPUTS = {"ia": 3, "ib": -2, "ic": 5}
+
+CASES = {}
+
+
+def case(name, unit):
+    # A case function takes the scale and returns (units, run); building the
+    # workload happens there and is not timed.
+    def register(setup):
+        CASES[name] = (unit, setup)
+        return setup
+    return register
+
+
+def scaled(count, scale):
+    return max(1, int(count * scale))
+
+
+def pipelineSource(scale):
+    return randomProgram(scaled(20_000, scale), depth=5, names=tuple(INPUTS), operators="+-*")
+
+
+@case("pipeline.lex", "tokens")
+def lexCase(scale):
+    source = pipelineSource(scale)
+    return len(pipeline.TokenBuffer(source)), lambda: pipeline.TokenBuffer(source)
+
+
+@case("pipeline.parse", "statements")
+def parseCase(scale):
+    tokens = pipeline.TokenBuffer(pipelineSource(scale))
+
+    def run():
+        return pipeline.Parser(tokens, pipeline.NodeFactory()).parse_program()
+    return len(run()), run
+
+
+@case("pipeline.optimize", "statements")
+def optimizeCase(scale):
+    program = pipeline.parse_program(pipelineSource(scale))
+    return len(program), lambda: pipeline.Optimizer().optimize(program)
+
+
+@case("pipeline.evaluate", "statements")
+def evaluateCase(scale):
+    program = pipeline.parse_program(pipelineSource(scale))
+
+    def run():
+        evaluator = pipeline.Evaluator()
+        evaluator.environment.update(INPUTS)
+        for statement in program:
+            evaluator.evaluate(statement)
+    return len(program), run
+
+
+@case("pipeline.codegen", "statements")
+def codegenCase(scale):
+    program = pipeline.parse_program(pipelineSource(scale))
+    return len(program), lambda: pipeline.CodeGenerator().generate_program(program)
+
+
+@case("pipeline.sized", "statements")
+def sizedCase(scale):
+    # Long flat-ish statements: 64 operands, at most 3 levels of parentheses.
+    source = randomProgram(scaled(2_000, scale), depth=3, operators="+-*", operands=64)
+
+    def run():
+        pipeline.CodeGenerator().generate_program(pipeline.parse_program(source))
+    return scaled(2_000, scale), run
+
+
+def lr0Rules(scale):
+    return expressionRules(scaled(120, scale), operatorsPerLevel=3)
+
+
+@case("lr0.collection", "states")
+def lr0CollectionCase(scale):
+    rules = lr0Rules(scale)
+
+    def run():
+        return lr0.constructCanonicalCollection(lr0.Grammar(rules))
+    return len(run()[0]), run
+
+
+@case("lr0.table", "states")
+def lr0TableCase(scale):
+    rules = lr0Rules(scale)
+
+    def run():
+        return lr0.compileParsingTable(lr0.Grammar(rules))
+    return run().stateCount, run
+
+
+def lr1Table(tableClass, rules):
+    # Grammar keeps the dict it is given and augmentGrammar adds S' to it.
+    grammar = lr1.Grammar(dict(rules))
+    grammar.setStartSymbol("S")
+    return tableClass(grammar)
+
+
+@case("lr1.collection", "states")
+def lr1CollectionCase(scale):
+    rules = expressionRules(scaled(16, scale), operatorsPerLevel=2)
+
+    def run():
+        table = lr1Table(lr1.ParsingTable, rules)
+        startSymbol, augmentedStart = table.augmentGrammar()
+        table.registerState([(augmentedStart, (".", startSymbol), "$")])
+        table.buildStates()
+        return table
+    return len(run().states), run
+
+
+@case("lr1.table", "states")
+def lr1TableCase(scale):
+    rules = expressionRules(scaled(16, scale), operatorsPerLevel=2)
+
+    def run():
+        table = lr1Table(lr1.ParsingTable, rules)
+        table.constructTable()
+        return table
+    return len(run().states), run
+
+
+@case("lalr.c", "states")
+def lalrCCase(scale):
+    # C's expression grammar is fixed in size; it covers the many-terminal,
+    # unary and postfix shapes the generated ladders lack.
+    rules = cExpressionRules()
+
+    def run():
+        table = lr1Table(lr1.LALRParsingTable, rules)
+        table.constructTable()
+        return table
+    return len(run().states), run
+
+
+@case("lalr.table", "states")
+def lalrTableCase(scale):
+    rules = expressionRules(scaled(40, scale), operatorsPerLevel=3)
+
+    def run():
+        table = lr1Table(lr1.LALRParsingTable, rules)
+        table.constructTable()
+        return table
+    return len(run().states), run
+
+
+@case("tac.generate", "statements")
+def tacCase(scale):
+    statements = scaled(5_000, scale)
+    source = "".join(f"{name} = {value}\n" for name, value in INPUTS.items())
+    source += randomProgram(statements, depth=5, names=tuple(INPUTS))
+    return statements, lambda: tac.QuadrupleCode().generate(source)
+
+
+def measure(name, scale, repeat):
+    unit, setup = CASES[name]
+    units, run = setup(scale)
+    seconds = best(run, repeat)
+    return {
+        "unit": unit,
+        "units": units,
+        "seconds": seconds,
+        "throughput": units / seconds,
+        "peak_bytes": peakMemory(run),
+    }
+
+
+def compare(result, reference, tolerance):
+    # Returns (throughput ratio, memory ratio, regressed).
+    speed = result["throughput"] / reference["throughput"]
+    memory = result["peak_bytes"] / reference["peak_bytes"] if reference["peak_bytes"] else 1.0
+    return speed, memory, speed < 1 - tolerance or memory > 1 + tolerance
+
+
+def loadBaseline(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def saveBaseline(path, baseline, results, scale, repeat):
+    # Cases left out by -k keep their previous entries.
+    cases = {}
+    if baseline is not None and baseline["scale"] == scale:
+        cases.update(baseline["cases"])
+    cases.update(results)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({
+            "scale": scale,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cases": dict(sorted(cases.items())),
+        }, file, indent=2)
+        file.write("\n")
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description="Benchmark the compilers against a stored baseline.")
+    arguments.add_argument("-k", "--filter", action="append", default=[],
+                           help="only run cases whose name contains this (repeatable)")
+    arguments.add_argument("--scale", type=float, default=1.0, help="multiply every workload size")
+    arguments.add_argument("--repeat", type=int, default=5, help="timed runs per case; the best counts")
+    arguments.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    arguments.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    arguments.add_argument("--tolerance", type=float, default=0.25,
+                           help="allowed relative throughput loss or memory growth")
+    arguments.add_argument("--json", help="also write this run's results here")
+    options = arguments.parse_args(argv)
+
+    names = [name for name in CASES if not options.filter or any(part in name for part in options.filter)]
+    baseline = loadBaseline(options.baseline)
+    reference = {}
+    if baseline is not None and baseline["scale"] == options.scale:
+        reference = baseline["cases"]
+    elif baseline is not None:
+        print(f"baseline was recorded at scale {baseline['scale']}, not {options.scale}; not comparing")
+
+    results = {}
+    regressions = []
+    print(f"{'case':>18} {'units':>8} {'seconds':>8} {'throughput':>12} {'unit':<12} {'peak MiB':>9}  vs baseline")
+    for name in names:
+        result = results[name] = measure(name, options.scale, options.repeat)
+        line = (f"{name:>18} {result['units']:>8} {result['seconds']:>8.4f} "
+                f"{result['throughput']:>12,.0f} {result['unit'] + '/s':<12} {result['peak_bytes'] / 2**20:>9.2f}")
+        if name in reference:
+            speed, memory, regressed = compare(result, reference[name], options.tolerance)
+            line += f"  {speed:.2f}x speed, {memory:.2f}x memory"
+            if regressed:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line, flush=True)
+
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if options.save:
+        saveBaseline(options.baseline, baseline, results, options.scale, options.repeat)
+        print(f"baseline written to {options.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
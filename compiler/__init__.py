@@ -0,0 +1,63 @@
+"""Importable entry point for the compilers in this repository.
+
+The compilers are standalone scripts in directories whose names are not
+valid identifiers, so they are exposed here as lazily loaded submodules:
+
+    pipeline    Python/Main.py (tokenizer, parser, optimizer, evaluators, code generator)
+    lexer, parser, optimizer, evaluator, codegen
+                the pieces of ``pipeline``, grouped by phase
+    lr0         LR(0)/Compiler.py
+    lr1         LR(1)/Complier.py
+    tac         Three Address Code(TAC)/Compiler.py
+    instrumentation
+                per-phase timing, counters and cache statistics for pipeline and lr0
+
+``import compiler`` loads nothing else; a submodule is imported the first
+time it is accessed, either as ``compiler.lr0`` or ``import compiler.lr0``.
+"""
+import importlib
+import os
+import sys
+from importlib.machinery import ModuleSpec, SourceFileLoader
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCES = {
+    'pipeline': os.path.join('Python', 'Main.py'),
+    'lr0': os.path.join('LR(0)', 'Compiler.py'),
+    'lr1': os.path.join('LR(1)', 'Complier.py'),
+    'tac': os.path.join('Three Address Code(TAC)', 'Compiler.py'),
+}
+
+SUBMODULES = ('pipeline', 'lexer', 'parser', 'optimizer', 'evaluator', 'codegen', 'lr0', 'lr1', 'tac',
+              'instrumentation')
+
+__all__ = list(SUBMODULES)
+
+
+class SourceFinder:
+    # Maps compiler.<name> onto the script files so the regular import
+    # machinery (sys.modules, __pycache__, pickling by module name) applies.
+    def find_spec(self, fullname, path=None, target=None):
+        package, _, name = fullname.rpartition('.')
+        if package != __name__ or name not in SOURCES:
+            return None
+        location = os.path.join(ROOT, SOURCES[name])
+        spec = ModuleSpec(fullname, SourceFileLoader(fullname, location), origin=location)
+        spec.has_location = True
+        return spec
+
+
+if not any(isinstance(finder, SourceFinder) for finder in sys.meta_path):
+    sys.meta_path.append(SourceFinder())
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES))
@@ -0,0 +1,4 @@
+from .pipeline import (
+    Bytecode, BytecodeCompiler, ClosureCompiler, Evaluator, IncrementalEvaluator, VectorEvaluator,
+    VirtualMachine, variables_read,
+)
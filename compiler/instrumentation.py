@@ -0,0 +1,195 @@
+"""Per-phase timing, counters and cache statistics for the compilers.
+
+The compiler modules keep a module-level ``instrumentation`` hook that is
+None by default, so each instrumented call site costs a single check when
+nothing is attached::
+
+    import compiler
+    from compiler.instrumentation import Instrumentation
+
+    recorder = Instrumentation(trace_memory=True)
+    recorder.attach(compiler.pipeline, compiler.lr0)
+    ...
+    print(recorder.to_prometheus())
+    recorder.detach()
+"""
+import json
+import time
+import tracemalloc
+
+
+class PhaseStats:
+    __slots__ = ('calls', 'seconds', 'allocated_bytes', 'peak_bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated_bytes = 0
+        self.peak_bytes = 0
+
+
+class Phase:
+    # Reused for every call of one phase; a stack of frames keeps nested and
+    # re-entrant calls correct.
+    __slots__ = ('recorder', 'stats', 'frames')
+
+    def __init__(self, recorder, stats):
+        self.recorder = recorder
+        self.stats = stats
+        self.frames = []
+
+    def __enter__(self):
+        if self.recorder.trace_memory:
+            self.frames.append((time.perf_counter(), self.recorder.enter_memory()))
+        else:
+            self.frames.append((time.perf_counter(), None))
+        return self
+
+    def __exit__(self, *exc_info):
+        started, memory = self.frames.pop()
+        stats = self.stats
+        stats.seconds += time.perf_counter() - started
+        stats.calls += 1
+        if memory is not None:
+            allocated, peak = self.recorder.exit_memory(memory)
+            stats.allocated_bytes += allocated
+            stats.peak_bytes = max(stats.peak_bytes, peak)
+        return False
+
+
+class Instrumentation:
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.stats = {}
+        self.counters = {}
+        self.caches = {}
+        self.memory_frames = []
+        self.started_tracing = False
+        self.modules = []
+
+    def attach(self, *modules):
+        # Modules expose set_instrumentation (snake_case files) or
+        # setInstrumentation (camelCase files).
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        for module in modules:
+            setter = getattr(module, 'set_instrumentation', None) or getattr(module, 'setInstrumentation')
+            setter(self)
+            self.modules.append(setter)
+        return self
+
+    def detach(self):
+        for setter in self.modules:
+            setter(None)
+        self.modules = []
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def reset(self):
+        for stats in self.stats.values():
+            stats.calls = stats.allocated_bytes = stats.peak_bytes = 0
+            stats.seconds = 0.0
+        self.counters.clear()
+        self.caches.clear()
+
+    def merge(self, snapshot):
+        # Folds in a snapshot() taken elsewhere, e.g. in a worker process.
+        for name, values in snapshot['phases'].items():
+            stats = self.phase(name).stats
+            stats.calls += values['calls']
+            stats.seconds += values['seconds']
+            stats.allocated_bytes += values.get('allocated_bytes', 0)
+            stats.peak_bytes = max(stats.peak_bytes, values.get('peak_bytes', 0))
+        for name, amount in snapshot['counters'].items():
+            self.count(name, amount)
+        for name, values in snapshot['caches'].items():
+            counts = self.caches.setdefault(name, [0, 0])
+            counts[0] += values['hits']
+            counts[1] += values['misses']
+
+    def phase(self, name):
+        phase = self.phases.get(name)
+        if phase is None:
+            stats = self.stats[name] = PhaseStats()
+            phase = self.phases[name] = Phase(self, stats)
+        return phase
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def cache(self, name, hit):
+        counts = self.caches.get(name)
+        if counts is None:
+            counts = self.caches[name] = [0, 0]
+        counts[0 if hit else 1] += 1
+
+    def enter_memory(self):
+        # tracemalloc has one peak; it is reset for each phase and the
+        # enclosing phase's running peak is folded in first so it survives.
+        current, peak = tracemalloc.get_traced_memory()
+        if self.memory_frames:
+            self.memory_frames[-1][1] = max(self.memory_frames[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        self.memory_frames.append(frame)
+        return frame
+
+    def exit_memory(self, frame):
+        current, peak = tracemalloc.get_traced_memory()
+        self.memory_frames.pop()
+        peak = max(frame[1], peak)
+        if self.memory_frames:
+            self.memory_frames[-1][1] = max(self.memory_frames[-1][1], peak)
+        return current - frame[0], peak - frame[0]
+
+    def snapshot(self):
+        phases = {}
+        for name, stats in self.stats.items():
+            phases[name] = {'calls': stats.calls, 'seconds': stats.seconds}
+            if self.trace_memory:
+                phases[name]['allocated_bytes'] = stats.allocated_bytes
+                phases[name]['peak_bytes'] = stats.peak_bytes
+        caches = {}
+        for name, (hits, misses) in self.caches.items():
+            total = hits + misses
+            caches[name] = {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+        return {'phases': phases, 'counters': dict(self.counters), 'caches': caches}
+
+    def to_json(self, **options):
+        return json.dumps(self.snapshot(), **options)
+
+    def to_prometheus(self, prefix='compiler'):
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, label, samples):
+            if not samples:
+                return
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+            for key, value in samples:
+                lines.append(f'{prefix}_{name}{{{label}="{escape_label(key)}"}} {value}')
+
+        phases = snapshot['phases'].items()
+        metric('phase_seconds_total', 'counter', 'Wall time spent in each phase.', 'phase',
+               [(name, stats['seconds']) for name, stats in phases])
+        metric('phase_calls_total', 'counter', 'Calls of each phase.', 'phase',
+               [(name, stats['calls']) for name, stats in phases])
+        if self.trace_memory:
+            metric('phase_allocated_bytes_total', 'counter', 'Net bytes allocated inside each phase.', 'phase',
+                   [(name, stats['allocated_bytes']) for name, stats in phases])
+            metric('phase_peak_bytes', 'gauge', 'Highest memory growth seen inside one call of each phase.', 'phase',
+                   [(name, stats['peak_bytes']) for name, stats in phases])
+        metric('items_total', 'counter', 'Tokens, nodes, states and other items processed.', 'item',
+               sorted(snapshot['counters'].items()))
+        caches = snapshot['caches'].items()
+        metric('cache_hits_total', 'counter', 'Cache hits.', 'cache', [(name, stats['hits']) for name, stats in caches])
+        metric('cache_misses_total', 'counter', 'Cache misses.', 'cache', [(name, stats['misses']) for name, stats in caches])
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
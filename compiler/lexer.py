@@ -0,0 +1,5 @@
+from .pipeline import (
+    KIND_ASSIGN, KIND_END, KIND_ID, KIND_LPAREN, KIND_MISMATCH, KIND_NEWLINE, KIND_NUMBER,
+    KIND_OP, KIND_RPAREN, KIND_WHITESPACE, Token, TokenBuffer, token_kinds,
+    token_specification, tokenize, tokenize_stream,
+)
@@ -0,0 +1 @@
+from .pipeline import Optimizer, count_nodes, number_value
@@ -0,0 +1,4 @@
+from .pipeline import (
+    AssignNode, BinOpNode, IfNode, NodeFactory, NumberNode, Parser, VariableNode,
+    operator_precedence, parse_program,
+)